@@ -28,17 +28,23 @@ export default function MyPage() {
 
       setLoadingPrompts(true);
       try {
-        const response = await fetch(`${API_URL}/users/me/prompts`, {
-          headers: {
-            Authorization: `Bearer ${token}`,
-          },
-        });
-
-        if (!response.ok) {
-          throw new Error("Failed to fetch user prompts.");
+        // The endpoint returns one page at a time; follow X-Next-Cursor until the last page
+        const data: Prompt[] = [];
+        let cursor: string | null = "";
+        while (cursor !== null) {
+          const response = await fetch(`${API_URL}/users/me/prompts?cursor=${encodeURIComponent(cursor)}`, {
+            headers: {
+              Authorization: `Bearer ${token}`,
+            },
+          });
+
+          if (!response.ok) {
+            throw new Error("Failed to fetch user prompts.");
+          }
+
+          data.push(...(await response.json()));
+          cursor = response.headers.get("X-Next-Cursor");
         }
-
-        const data: Prompt[] = await response.json();
         setUserPrompts(data);
       } catch (error) {
         console.error("Error fetching user prompts:", error);
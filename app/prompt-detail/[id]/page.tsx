@@ -75,8 +75,8 @@ export default function PromptDetailPage({ params }: { params: { id: string } })
         });
 
         if (response.ok) {
-          const updatedPrompt = await response.json();
-          setPrompt(updatedPrompt); // Update prompt state with new view count
+          const counters = await response.json();
+          setPrompt((prev) => (prev ? { ...prev, ...counters } : prev)); // Merge the new view/like counts into the prompt
         }
       } catch (error) {
         console.error("Failed to increment view count", error);
@@ -0,0 +1,174 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from backend import database as models, schemas
+from backend.auth import get_current_user_or_none_async, get_user_by_username_async, verify_access_token
+from backend.counters import COUNTER_COLUMNS, recent_views, view_buffer
+from backend.database import get_async_db
+from backend.etag import check_etag, make_etag
+from backend.fieldsets import parse_fields, prompt_load_options, wants_feedback
+from backend.pagination import CURSOR_ORDER, NEXT_CURSOR_HEADER, cursor_criteria, split_page
+from backend.prompt_responses import FULL_FIELDS, SUMMARY_FIELDS, SUMMARY_LOAD_OPTIONS, prompt_rows, prompt_version, subjects_map
+from backend.serialization import json_response, validated_list_response, validated_response
+
+# Async versions of the hot read endpoints, served instead of the sync ones when DB_MODE=async.
+# Responses are identical; only the database driver and session type differ.
+router = APIRouter()
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db, scope="function")):
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    username = verify_access_token(token, credentials_exception)
+    user = await get_user_by_username_async(db, username)
+    if user is None:
+        raise credentials_exception
+    return user
+
+
+async def load_user_feedback_async(db: AsyncSession, prompts: List[models.Prompt], current_user: Optional[models.User]):
+    """Returns {prompt_id: feedback_type} for the current user, using a single lookup for the whole page."""
+    if not current_user or not prompts:
+        return {}
+    rows = await db.execute(
+        select(models.PromptFeedback.prompt_id, models.PromptFeedback.feedback_type).where(
+            models.PromptFeedback.user_id == current_user.id,
+            models.PromptFeedback.prompt_id.in_([p.id for p in prompts])
+        )
+    )
+    return {prompt_id: feedback_type for prompt_id, feedback_type in rows}
+
+
+async def counters_with_pending_async(db: AsyncSession, prompt_id: int):
+    """Async counterpart of counters_with_pending."""
+    while True:
+        sequence, pending = view_buffer.pending_snapshot(prompt_id)
+        if sequence % 2:
+            await run_in_threadpool(view_buffer.wait_for_flush)
+            continue
+        counters = (await db.execute(select(*COUNTER_COLUMNS).where(models.Prompt.id == prompt_id))).first()
+        if view_buffer.flush_sequence() == sequence:
+            break
+        await db.rollback()
+
+    if counters is None:
+        return None
+    views, likes, dislikes = counters
+    return views + pending, likes, dislikes
+
+
+@router.get("/prompts/", response_model=List[schemas.PromptSummary])
+async def read_prompts_async(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    subject_id: str | None = None,
+    cursor: str | None = None,
+    exact_views: bool = False,
+    fields: str | None = None,
+    db: AsyncSession = Depends(get_async_db, scope="function"),
+    current_user: Optional[models.User] = Depends(get_current_user_or_none_async)
+):
+    # Owners must be loaded eagerly: an AsyncSession cannot lazy-load `author` during serialization
+    selected = parse_fields(fields)
+    stmt = select(models.Prompt).options(*(SUMMARY_LOAD_OPTIONS if selected is None else prompt_load_options(selected)))
+
+    if subject_id and subject_id in subjects_map:
+        stmt = stmt.where(models.Prompt.subject == subjects_map[subject_id])
+
+    if cursor is not None:
+        stmt = stmt.where(*cursor_criteria(cursor)).order_by(*CURSOR_ORDER).limit(limit + 1)
+        prompts, next_cursor = split_page((await db.execute(stmt)).scalars().all(), limit)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    else:
+        prompts = (await db.execute(stmt.offset(skip).limit(limit))).scalars().all()
+
+    feedback_by_prompt = await load_user_feedback_async(db, prompts, current_user) if wants_feedback(selected) else {}
+
+    response.headers["Vary"] = "Authorization"
+    etag = make_etag([prompt_version(p, feedback_by_prompt.get(p.id), exact_views) for p in prompts])
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    if selected is not None:
+        return json_response(response, prompt_rows(prompts, selected, feedback_by_prompt, exact_views))
+    return validated_list_response(response, schemas.PromptSummary, prompt_rows(prompts, SUMMARY_FIELDS, feedback_by_prompt, exact_views))
+
+
+@router.get("/prompts/{prompt_id}", response_model=schemas.Prompt)
+async def read_prompt_async(
+    request: Request,
+    response: Response,
+    prompt_id: int,
+    exact_views: bool = False,
+    fields: str | None = None,
+    db: AsyncSession = Depends(get_async_db, scope="function"),
+    current_user: Optional[models.User] = Depends(get_current_user_or_none_async)
+):
+    selected = parse_fields(fields)
+    options = (joinedload(models.Prompt.owner),) if selected is None else prompt_load_options(selected)
+    result = await db.execute(select(models.Prompt).options(*options).where(models.Prompt.id == prompt_id))
+    db_prompt = result.scalars().first()
+    if db_prompt is None:
+        raise HTTPException(status_code=404, detail="Prompt not found")
+
+    feedback_by_prompt = await load_user_feedback_async(db, [db_prompt], current_user) if wants_feedback(selected) else {}
+
+    response.headers["Vary"] = "Authorization"
+    etag = make_etag(prompt_version(db_prompt, feedback_by_prompt.get(prompt_id), exact_views))
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    if selected is not None:
+        return json_response(response, prompt_rows([db_prompt], selected, feedback_by_prompt, exact_views)[0])
+    return validated_response(response, schemas.Prompt, prompt_rows([db_prompt], FULL_FIELDS, feedback_by_prompt, exact_views)[0])
+
+
+@router.post("/prompts/{prompt_id}/increment-view", response_model=schemas.PromptCounters)
+async def increment_prompt_view_async(
+    prompt_id: int,
+    db: AsyncSession = Depends(get_async_db, scope="function"),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    counters = await counters_with_pending_async(db, prompt_id)
+    if counters is None:
+        raise HTTPException(status_code=404, detail="Prompt not found")
+
+    # Same dedupe and write-behind buffer as the sync endpoint
+    counted = 0
+    if recent_views.first_view(current_user.id, prompt_id):
+        view_buffer.add(prompt_id)
+        counted = 1
+
+    views, likes, dislikes = counters
+    return schemas.PromptCounters(id=prompt_id, views=views + counted, likes=likes, dislikes=dislikes)
+
+
+def use_async_routes(app: FastAPI):
+    """Replaces the sync handlers of the routes above with their async versions."""
+    replaced = {(route.path, method) for route in router.routes for method in route.methods}
+    app.router.routes = [
+        route for route in app.router.routes
+        if not (isinstance(route, APIRoute) and any((route.path, method) in replaced for method in route.methods))
+    ]
+    app.include_router(router)
+
+    @app.on_event("shutdown")
+    async def dispose_async_engine():
+        await models.async_engine.dispose()
@@ -1,7 +1,15 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
-from backend.database import get_db, User
+from backend.database import get_db, get_async_db, User
+from backend.cache import TTLCache
+from backend.histogram import Histogram
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status
 from jose import JWTError, jwt
@@ -14,18 +22,54 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 # Configure password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Dedicated, bounded pool for bcrypt so hashing never runs on the event loop and
+# a login burst cannot occupy FastAPI's shared threadpool. bcrypt releases the GIL.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
+# Time spent in bcrypt itself (ms), excluding the wait for a password worker
+PASSWORD_BUCKETS_MS = (25, 50, 100, 200, 300, 500, 750, 1000, 2000, 5000)
+password_hash_ms = Histogram(PASSWORD_BUCKETS_MS)
+password_verify_ms = Histogram(PASSWORD_BUCKETS_MS)
+
 # JWT configuration
 SECRET_KEY = "your-secret-key"  # Change this in production!
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Resolved users keyed by JWT subject, so authenticated requests skip the users query.
+# Invalidation is per process; the TTL bounds how long other workers can serve a stale user.
+user_cache = TTLCache(
+    "users",
+    ttl=float(os.getenv("USER_CACHE_TTL_SECONDS", "60")),
+    maxsize=int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000")),
+)
+
 def get_password_hash(password: str) -> str:
     """Hashes the given password."""
-    return pwd_context.hash(password)
+    started = time.perf_counter()
+    try:
+        return pwd_context.hash(password)
+    finally:
+        password_hash_ms.observe((time.perf_counter() - started) * 1000)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    started = time.perf_counter()
+    try:
+        return pwd_context.verify(plain_password, hashed_password)
+    finally:
+        password_verify_ms.observe((time.perf_counter() - started) * 1000)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hashes the given password on the password worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verifies a password on the password worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, verify_password, plain_password, hashed_password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -47,15 +91,60 @@ def verify_access_token(token: str, credentials_exception):
     except JWTError:
         raise credentials_exception
 
-def get_current_user_or_none(token: Optional[str] = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Optional[User]:
+def _detached_copy(user: User) -> User:
+    # A column-only copy that no session owns, safe to share between requests
+    copy = User(**{attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs})
+    make_transient_to_detached(copy)
+    return copy
+
+def get_user_by_username(db: Session, username: str) -> Optional[User]:
+    """Returns the user attached to `db`, served from the user cache when possible."""
+    def load():
+        # A short session of its own, so a cache miss does not leave `db` holding a
+        # connection while the request waits for a thread to run the endpoint
+        with Session(bind=db.get_bind()) as lookup:
+            user = lookup.query(User).filter(User.username == username).first()
+            return _detached_copy(user) if user else None
+
+    cached = user_cache.get_or_load(username, load)
+    if cached is None:
+        return None
+    # merge(load=False) attaches a per-session copy without emitting a SELECT
+    return db.merge(cached, load=False)
+
+async def get_user_by_username_async(db: AsyncSession, username: str) -> Optional[User]:
+    """Async counterpart of get_user_by_username, sharing the same cache."""
+    async def load():
+        user = (await db.execute(select(User).where(User.username == username))).scalars().first()
+        return _detached_copy(user) if user else None
+
+    cached = await user_cache.get_or_load_async(username, load)
+    if cached is None:
+        return None
+    return await db.merge(cached, load=False)
+
+def invalidate_user(username: str):
+    """Drops a user from the cache; call after modifying the user row."""
+    user_cache.invalidate(username)
+
+def token_subject(token: Optional[str]) -> Optional[str]:
+    """Returns the username of a valid token, or None for a missing or invalid one."""
     if token is None:
         return None
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            return None
-        user = db.query(User).filter(User.username == username).first()
-        return user
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+    return payload.get("sub")
+
+def get_current_user_or_none(token: Optional[str] = Depends(oauth2_scheme), db: Session = Depends(get_db, scope="function")) -> Optional[User]:
+    username = token_subject(token)
+    if username is None:
+        return None
+    return get_user_by_username(db, username)
+
+async def get_current_user_or_none_async(token: Optional[str] = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db, scope="function")) -> Optional[User]:
+    username = token_subject(token)
+    if username is None:
+        return None
+    return await get_user_by_username_async(db, username)
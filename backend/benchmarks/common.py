@@ -0,0 +1,61 @@
+import os
+import statistics
+import tempfile
+from typing import Dict, List, Optional
+
+
+def percentiles(samples_ms: List[float]) -> Dict[str, float]:
+    """Summarizes latency samples (in milliseconds) as count/mean/p50/p95/p99."""
+    if not samples_ms:
+        return {"count": 0}
+    ordered = sorted(samples_ms)
+
+    def pick(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))], 3)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.mean(ordered), 3),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+    }
+
+
+def use_benchmark_database(database_url: Optional[str] = None) -> str:
+    """
+    Points the app at a throwaway database. Must run before `backend.database`
+    is imported, since the engine is created at import time. Without a URL the
+    app falls back to ./sql_app.db, so the working directory is moved to a
+    fresh temporary directory first.
+    """
+    if database_url:
+        os.environ["DATABASE_URL"] = database_url
+        return database_url
+    os.environ.pop("DATABASE_URL", None)
+    os.chdir(tempfile.mkdtemp(prefix="prompt-bench-"))
+    return "sqlite:///" + os.path.join(os.getcwd(), "sql_app.db")
+
+
+def require_reset(database_url: Optional[str], reset: bool):
+    """
+    Refuses to wipe a database the benchmark did not create: a --database-url is
+    only dropped and reseeded when --reset is passed too.
+    """
+    if database_url and not reset:
+        raise SystemExit(
+            "Refusing to drop and reseed the tables of --database-url; "
+            "pass --reset if this database is disposable"
+        )
+
+
+def recreate_tables(engine):
+    """Drops and recreates the app's tables on `engine`, leaving them empty."""
+    from backend.database import Base
+
+    with engine.begin() as conn:
+        # The SQLite full-text table is not part of the metadata; drop it so setup_search rebuilds it
+        if engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("DROP TABLE IF EXISTS prompts_fts")
+        Base.metadata.drop_all(conn)
+        Base.metadata.create_all(conn)
@@ -0,0 +1,266 @@
+"""
+Generates a large synthetic dataset of users, prompts and feedback for scaling tests.
+
+Rows are bulk-inserted with Core executemany in batches, never through ORM
+add(), so a million feedback rows take minutes rather than hours. Prompt
+popularity and user activity follow power laws: most prompts get little
+feedback and a few get a lot, and a minority of users write most prompts.
+Prompt content is Korean Markdown, and every prompt's likes/dislikes equal
+its rows in prompt_feedback. Rows are appended after the existing ids, so the
+generator can also grow an existing database.
+
+    python -m backend.benchmarks.dataset --users 10000 --prompts 100000 --feedback 1000000
+    python -m backend.benchmarks.dataset --database-url postgresql://... --verify
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import case, create_engine, func, insert, or_, select
+
+from backend.auth import get_password_hash
+from backend.database import Base, Prompt, PromptFeedback, School, Subject, User, normalize_database_url
+from backend.excerpt import make_excerpt
+from backend.search import setup_search
+
+PASSWORD = "dataset-password"
+SCHOOLS = ["전남대학교", "전북대학교", "부산대학교", "경북대학교", "충남대학교", "서울대학교", "광주과학기술원"]
+DEFAULT_SUBJECTS = ["산업공학입문", "경제성공학", "확률통계"]
+WORDS = [
+    "프롬프트", "확률", "통계", "경제성", "공학", "산업", "입문", "과제", "요약", "설명", "예제", "문제",
+    "풀이", "분석", "데이터", "모델", "회귀", "분포", "기댓값", "분산", "정규분포", "베이즈", "가설검정",
+    "현금흐름", "이자율", "감가상각", "최적화", "시뮬레이션", "대기행렬", "품질관리", "생산계획",
+    "단계별로", "정리해줘", "알려줘", "비교해줘", "작성해줘", "학생", "시험", "리포트", "발표",
+    "개념", "공식", "증명", "직관적으로", "표로", "코드로", "파이썬", "엑셀", "그래프", "핵심만",
+]
+# Zipf weights: the first words are common, the rest increasingly rare
+WORD_WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, len(WORDS) + 1)))
+SURNAMES = ["김", "이", "박", "최", "정", "강", "조", "윤", "장", "임"]
+GIVEN_NAME_SYLLABLES = ["민", "서", "지", "현", "우", "준", "윤", "하", "은", "도", "연", "수", "예", "진", "호"]
+
+# Longer text would exceed PostgreSQL's btree row limit on the indexed prompts.content
+MAX_CONTENT_WORDS = 200
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choices(WORDS, cum_weights=WORD_WEIGHTS, k=count))
+
+
+def _content(rng: random.Random) -> str:
+    budget = int(min(rng.paretovariate(1.5) * 30, MAX_CONTENT_WORDS))
+    parts = [f"## {_words(rng, 3)}", _words(rng, max(budget // 2, 5))]
+    if budget > 40:
+        parts.append("\n".join(f"- {_words(rng, rng.randint(3, 8))}" for _ in range(rng.randint(2, 5))))
+        parts.append(_words(rng, budget // 4))
+    return "\n\n".join(parts)
+
+
+def _name(rng: random.Random) -> str:
+    return rng.choice(SURNAMES) + "".join(rng.choices(GIVEN_NAME_SYLLABLES, k=2))
+
+
+def _power_law_weights(rng: random.Random, count: int, alpha: float) -> List[float]:
+    """Pareto-distributed popularity of `count` items."""
+    return [rng.paretovariate(alpha) for _ in range(count)]
+
+
+def _feedback_counts(rng: random.Random, popularity: List[float], total: int, users: int) -> List[int]:
+    """
+    Splits `total` feedback rows across prompts in proportion to their popularity.
+    A user rates a prompt at most once, so no prompt gets more than `users` rows; the
+    share cut from those prompts goes to the others.
+    """
+    total = min(total, users * len(popularity))
+    capped = set()
+    while True:
+        open_weight = sum(weight for index, weight in enumerate(popularity) if index not in capped)
+        scale = (total - users * len(capped)) / open_weight
+        newly_capped = {
+            index for index, weight in enumerate(popularity) if index not in capped and weight * scale > users
+        }
+        if not newly_capped:
+            break
+        capped |= newly_capped
+    counts = []
+    for index, weight in enumerate(popularity):
+        if index in capped:
+            counts.append(users)
+            continue
+        expected = weight * scale
+        # Randomized rounding keeps the sum close to `total`
+        counts.append(min(int(expected) + (rng.random() < expected - int(expected)), users))
+    return counts
+
+
+def _voters(rng: random.Random, user_ids: range, activity: List[float], count: int) -> List[int]:
+    """`count` distinct users, biased towards active ones."""
+    if count > len(user_ids) // 4:
+        # Weighted draws would mostly repeat; a uniform sample is close enough at this size
+        return rng.sample(user_ids, count)
+    chosen = set()
+    while len(chosen) < count:
+        chosen.update(rng.choices(user_ids, cum_weights=activity, k=count - len(chosen)))
+    return list(chosen)
+
+
+def _ensure_names(conn, model, names: List[str]) -> List[str]:
+    existing = set(conn.execute(select(model.name)).scalars())
+    missing = [name for name in names if name not in existing]
+    if missing:
+        conn.execute(insert(model), [{"name": name} for name in missing])
+    return sorted(existing | set(names))
+
+
+def _sync_sequences(conn, tables):
+    # Explicit ids leave PostgreSQL's serial sequences behind; move them past the new rows
+    if conn.dialect.name != "postgresql":
+        return
+    for table in tables:
+        conn.exec_driver_sql(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT coalesce(max(id), 1) FROM {table}))"
+        )
+
+
+def generate(engine, users: int, prompts: int, feedback: int, seed_value: int = 42,
+             batch_size: int = 5000, password: str = PASSWORD, days: int = 365) -> dict:
+    """
+    Appends `users` users, `prompts` prompts and about `feedback` feedback rows to the
+    database behind `engine` (whose tables must exist), in transactions of
+    `batch_size` prompts. Every user gets the same `password`. Returns row counts and
+    the elapsed time.
+    """
+    if users < 1 or prompts < 1:
+        raise ValueError("users and prompts must be at least 1")
+    started = time.perf_counter()
+    rng = random.Random(seed_value)
+    # bcrypt once, shared by every user
+    hashed_password = get_password_hash(password)
+    end = datetime.utcnow().replace(microsecond=0)
+    start = end - timedelta(days=days)
+
+    with engine.begin() as conn:
+        _ensure_names(conn, School, SCHOOLS)
+        subjects = _ensure_names(conn, Subject, DEFAULT_SUBJECTS)
+        first_user = (conn.execute(select(func.max(User.id))).scalar() or 0) + 1
+        first_prompt = (conn.execute(select(func.max(Prompt.id))).scalar() or 0) + 1
+    subject_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(subjects) + 1)))
+
+    user_ids = range(first_user, first_user + users)
+    activity = list(itertools.accumulate(_power_law_weights(rng, users, alpha=1.2)))
+    for offset in range(0, users, batch_size):
+        with engine.begin() as conn:
+            conn.execute(insert(User), [
+                {
+                    "id": user_id, "username": f"user{user_id}", "email": f"user{user_id}@example.com",
+                    "hashed_password": hashed_password, "is_active": True, "is_admin": False,
+                    "created_at": start + timedelta(seconds=rng.randint(0, days * 86400)),
+                    "name": _name(rng), "gender": rng.choice(["male", "female"]), "age": str(rng.randint(19, 29)),
+                    "school": rng.choice(SCHOOLS), "studentId": str(rng.randint(2015, 2025) * 100000 + user_id % 100000),
+                }
+                for user_id in user_ids[offset:offset + batch_size]
+            ])
+
+    counts = _feedback_counts(rng, _power_law_weights(rng, prompts, alpha=1.1), feedback, users)
+    prompt_step = days * 86400 / prompts
+    feedback_rows = 0
+    for offset in range(0, prompts, batch_size):
+        prompt_rows, batch_feedback = [], []
+        for index in range(offset, min(offset + batch_size, prompts)):
+            prompt_id = first_prompt + index
+            # Ids grow with created_at, like prompts created through the API
+            created_at = start + timedelta(seconds=int(index * prompt_step))
+            like_rate = rng.betavariate(6, 2)
+            likes = dislikes = 0
+            for user_id in _voters(rng, user_ids, activity, counts[index]):
+                liked = rng.random() < like_rate
+                likes += liked
+                dislikes += not liked
+                batch_feedback.append({
+                    "user_id": user_id, "prompt_id": prompt_id, "feedback_type": "like" if liked else "dislike",
+                    "created_at": min(created_at + timedelta(seconds=rng.randint(0, 30 * 86400)), end),
+                })
+            content = _content(rng)
+            prompt_rows.append({
+                "id": prompt_id, "title": _words(rng, rng.randint(2, 6)), "content": content, "excerpt": make_excerpt(content),
+                "subject": rng.choices(subjects, cum_weights=subject_weights)[0], "created_at": created_at,
+                "owner_id": rng.choices(user_ids, cum_weights=activity)[0],
+                "views": (likes + dislikes) * rng.randint(5, 30) + rng.randint(0, 100),
+                "likes": likes, "dislikes": dislikes,
+            })
+        with engine.begin() as conn:
+            conn.execute(insert(Prompt), prompt_rows)
+            if batch_feedback:
+                conn.execute(insert(PromptFeedback), batch_feedback)
+        feedback_rows += len(batch_feedback)
+
+    with engine.begin() as conn:
+        _sync_sequences(conn, ["users", "prompts"])
+    return {
+        "users": users,
+        "prompts": prompts,
+        "feedback": feedback_rows,
+        "first_user_id": first_user,
+        "first_prompt_id": first_prompt,
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+
+
+def counter_mismatches(engine) -> int:
+    """Number of prompts whose likes/dislikes differ from their prompt_feedback rows."""
+    totals = (
+        select(
+            PromptFeedback.prompt_id,
+            func.sum(case((PromptFeedback.feedback_type == "like", 1), else_=0)).label("likes"),
+            func.sum(case((PromptFeedback.feedback_type == "dislike", 1), else_=0)).label("dislikes"),
+        )
+        .group_by(PromptFeedback.prompt_id)
+        .subquery()
+    )
+    query = (
+        select(func.count())
+        .select_from(Prompt)
+        .outerjoin(totals, totals.c.prompt_id == Prompt.id)
+        .where(or_(
+            Prompt.likes != func.coalesce(totals.c.likes, 0),
+            Prompt.dislikes != func.coalesce(totals.c.dislikes, 0),
+        ))
+    )
+    with engine.connect() as conn:
+        return conn.execute(query).scalar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--prompts", type=int, default=100000)
+    parser.add_argument("--feedback", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000, help="prompts (or users) per transaction")
+    parser.add_argument("--password", default=PASSWORD, help="password of every generated user")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"),
+                        help="defaults to DATABASE_URL, then to a new temporary SQLite file")
+    parser.add_argument("--verify", action="store_true", help="check likes/dislikes against prompt_feedback afterwards")
+    args = parser.parse_args()
+
+    url = args.database_url or "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="prompt-dataset-"), "sql_app.db")
+    engine = create_engine(normalize_database_url(url))
+    Base.metadata.create_all(engine)
+
+    summary = generate(engine, args.users, args.prompts, args.feedback, args.seed, args.batch_size, args.password)
+    # On a new database the search index is built once after the load instead of by per-row triggers
+    setup_search(engine)
+    summary["database"] = engine.url.render_as_string(hide_password=True)
+    summary["rows_per_second"] = round((summary["users"] + summary["prompts"] + summary["feedback"]) / summary["seconds"])
+    if args.verify:
+        summary["counter_mismatches"] = counter_mismatches(engine)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Load-tests the API with realistic request mixes and reports JSON results per scenario.
+
+Seeds a throwaway database with --users, --prompts and --feedback rows, then
+drives the real app either in-process over ASGI (--target inprocess) or through
+a local uvicorn server (--target uvicorn). Each scenario reports throughput,
+p50/p95/p99 latency and SQL statements per request, read from the app's
+Server-Timing header. Runs are reproducible for a given --seed.
+
+    python -m backend.benchmarks.load_test --users 200 --prompts 5000 --feedback 20000
+    python -m backend.benchmarks.load_test --target uvicorn --workers 2 --output run.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+
+from backend.benchmarks.common import percentiles, recreate_tables, require_reset, use_benchmark_database
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    raise SystemExit("The benchmarks need httpx: pip install -r backend/benchmarks/requirements.txt")
+
+PASSWORD = "benchmark-password"
+SUBJECTS = {"1": "산업공학입문", "2": "경제성공학", "3": "확률통계"}
+SCENARIOS = ["anonymous_listing", "logged_in_listing", "detail_view", "feedback_toggle", "login", "mixed"]
+# Share of each scenario in the "mixed" run, roughly what the web frontend sends
+MIX_WEIGHTS = {"anonymous_listing": 35, "logged_in_listing": 25, "detail_view": 25, "feedback_toggle": 10, "login": 5}
+
+_QUERIES = re.compile(r'desc="(\d+) queries"')
+_DB_TIME = re.compile(r"db;dur=([\d.]+)")
+
+
+class Requests:
+    """Builds the request for each scenario; the same seed gives the same sequence."""
+
+    def __init__(self, users: int, prompts: int, tokens: dict, seed_value: int):
+        self.users = users
+        self.prompts = prompts
+        self.tokens = tokens
+        self.rng = random.Random(seed_value)
+
+    def _auth(self):
+        return {"Authorization": f"Bearer {self.tokens[self.rng.randint(1, len(self.tokens))]}"}
+
+    def _listing_params(self):
+        params = {"limit": 30, "skip": self.rng.choice([0, 0, 0, 30, 60])}
+        if self.rng.random() < 0.3:
+            params["subject_id"] = self.rng.choice(list(SUBJECTS))
+        return params
+
+    def build(self, scenario: str):
+        if scenario == "mixed":
+            names = list(MIX_WEIGHTS)
+            scenario = self.rng.choices(names, weights=[MIX_WEIGHTS[name] for name in names])[0]
+        if scenario == "anonymous_listing":
+            return "GET", "/prompts/", {"params": self._listing_params()}
+        if scenario == "logged_in_listing":
+            return "GET", "/prompts/", {"params": self._listing_params(), "headers": self._auth()}
+        if scenario == "detail_view":
+            return "GET", f"/prompts/{self.rng.randint(1, self.prompts)}", {"headers": self._auth()}
+        if scenario == "feedback_toggle":
+            return "POST", f"/prompts/{self.rng.randint(1, self.prompts)}/feedback", {
+                "json": {"feedback_type": self.rng.choice(["like", "dislike"])}, "headers": self._auth(),
+            }
+        if scenario == "login":
+            return "POST", "/token", {"json": {"username": f"user{self.rng.randint(1, self.users)}", "password": PASSWORD}}
+        raise ValueError(scenario)
+
+
+async def run_scenario(client, requests: Requests, scenario: str, count: int, concurrency: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        method, url, kwargs = requests.build(scenario)
+        await client.request(method, url, **kwargs)
+
+    latencies, queries, db_ms = [], [], []
+    errors = {}
+    remaining = count
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            method, url, kwargs = requests.build(scenario)
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+            timing = response.headers.get("server-timing", "")
+            query_match, db_match = _QUERIES.search(timing), _DB_TIME.search(timing)
+            if query_match:
+                queries.append(int(query_match.group(1)))
+            if db_match:
+                db_ms.append(float(db_match.group(1)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "scenario": scenario,
+        "requests": count,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": round(count / elapsed, 2),
+        "latency": percentiles(latencies),
+        "queries_per_request": {
+            "mean": round(sum(queries) / len(queries), 2) if queries else None,
+            "max": max(queries) if queries else None,
+        },
+        "db_ms_per_request": round(sum(db_ms) / len(db_ms), 3) if db_ms else None,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_until_up(client, process, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("uvicorn exited during startup")
+        try:
+            await client.get("/")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+    raise SystemExit("uvicorn did not start in time")
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args, database_url: str) -> dict:
+    from backend.auth import create_access_token
+
+    # Tokens are minted directly so only the login scenario pays for bcrypt
+    tokens = {i: create_access_token({"sub": f"user{i}"}) for i in range(1, min(args.users, args.token_users) + 1)}
+    scenarios = args.scenarios.split(",") if args.scenarios else SCENARIOS
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    process = None
+    if args.target == "inprocess":
+        from backend.main import app
+
+        await app.router.startup()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load-test", timeout=120)
+    else:
+        port = _free_port()
+        env = dict(os.environ, DATABASE_URL=database_url)
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--workers", str(args.workers), "--log-level", "warning"],
+            cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+            env=env,
+        )
+        client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=120, limits=limits)
+
+    results = []
+    try:
+        if process is not None:
+            await _wait_until_up(client, process)
+        for index, scenario in enumerate(scenarios):
+            requests = Requests(args.users, args.prompts, tokens, args.seed + index)
+            count = args.login_requests if scenario == "login" else args.requests
+            result = await run_scenario(client, requests, scenario, count, args.concurrency, args.warmup)
+            print(f"--- {scenario}: {result['throughput_rps']} req/s ---", file=sys.stderr)
+            results.append(result)
+    finally:
+        await client.aclose()
+        if process is not None:
+            process.terminate()
+            process.wait()
+        else:
+            await app.router.shutdown()
+
+    return {
+        "commit": _git_commit(),
+        "target": args.target,
+        "workers": args.workers if args.target == "uvicorn" else None,
+        "database": database_url.split(":", 1)[0],
+        "db_mode": os.getenv("DB_MODE", "sync"),
+        "dataset": {"users": args.users, "prompts": args.prompts, "feedback": args.feedback, "seed": args.seed},
+        "scenarios": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target", choices=["inprocess", "uvicorn"], default="inprocess")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes (--target uvicorn)")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--prompts", type=int, default=5000)
+    parser.add_argument("--feedback", type=int, default=20000)
+    parser.add_argument("--scenarios", help=f"comma-separated subset of {','.join(SCENARIOS)}")
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--login-requests", type=int, default=50, help="requests for the bcrypt-bound login scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=10, help="unmeasured requests before each scenario")
+    parser.add_argument("--token-users", type=int, default=50, help="how many users the logged-in scenarios act as")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--reset", action="store_true", help="allow dropping and reseeding the tables of --database-url")
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    args = parser.parse_args()
+
+    require_reset(args.database_url, args.reset)
+    database_url = use_benchmark_database(args.database_url)
+    from backend.benchmarks.dataset import generate
+    from backend.database import engine
+
+    recreate_tables(engine)
+    # The tables are fresh, so the generated users and prompts are numbered from 1
+    seeded = generate(engine, args.users, args.prompts, args.feedback, args.seed, password=PASSWORD)
+    print(f"--- Seeded {seeded['users']} users, {seeded['prompts']} prompts, {seeded['feedback']} feedback rows "
+          f"in {seeded['seconds']}s ---", file=sys.stderr)
+
+    results = asyncio.run(run(args, database_url))
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
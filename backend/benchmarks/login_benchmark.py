@@ -0,0 +1,116 @@
+"""
+Measures how a burst of logins affects the latency of an unrelated endpoint.
+
+Runs the real app in-process over ASGI. A probe keeps requesting GET / while
+`--logins` concurrent POST /token requests are served, and the probe's
+latency is compared with an idle baseline. `--inline-bcrypt` verifies
+passwords on the event loop, as /token used to, for a before/after comparison.
+The tables of an existing --database-url are only dropped and recreated with --reset.
+
+    python -m backend.benchmarks.login_benchmark --logins 50
+    python -m backend.benchmarks.login_benchmark --database-url postgresql://... --reset
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from backend.benchmarks.common import percentiles, recreate_tables, require_reset, use_benchmark_database
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    raise SystemExit("The benchmarks need httpx: pip install -r backend/benchmarks/requirements.txt")
+
+PASSWORD = "benchmark-password"
+
+
+async def _probe(client, stop: asyncio.Event, interval: float) -> list:
+    samples = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/")
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def _login(client, samples: list):
+    started = time.perf_counter()
+    response = await client.post("/token", json={"username": "bench", "password": PASSWORD})
+    response.raise_for_status()
+    samples.append((time.perf_counter() - started) * 1000)
+
+
+async def run(args) -> dict:
+    from backend.main import app
+
+    if args.inline_bcrypt:
+        import backend.main
+        from backend.auth import verify_password
+
+        async def verify_on_event_loop(plain_password, hashed_password):
+            return verify_password(plain_password, hashed_password)
+
+        backend.main.verify_password_async = verify_on_event_loop
+
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.post("/signup", json={
+                "username": "bench", "email": "bench@example.com", "password": PASSWORD,
+                "name": "벤치", "gender": "-", "age": "-", "school": "-", "studentId": "-",
+            })
+
+            # Idle baseline for the probe
+            stop = asyncio.Event()
+            probe = asyncio.create_task(_probe(client, stop, args.probe_interval))
+            await asyncio.sleep(args.baseline_seconds)
+            stop.set()
+            baseline = await probe
+
+            # Probe again while the login burst is being served
+            stop = asyncio.Event()
+            probe = asyncio.create_task(_probe(client, stop, args.probe_interval))
+            login_samples = []
+            started = time.perf_counter()
+            await asyncio.gather(*(_login(client, login_samples) for _ in range(args.logins)))
+            burst_seconds = time.perf_counter() - started
+            stop.set()
+            during_burst = await probe
+    finally:
+        await app.router.shutdown()
+
+    return {
+        "scenario": "login_burst",
+        "inline_bcrypt": args.inline_bcrypt,
+        "logins": args.logins,
+        "logins_per_second": round(args.logins / burst_seconds, 2),
+        "login_latency": percentiles(login_samples),
+        "probe_idle": percentiles(baseline),
+        "probe_during_burst": percentiles(during_burst),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--probe-interval", type=float, default=0.005)
+    parser.add_argument("--baseline-seconds", type=float, default=1.0)
+    parser.add_argument("--inline-bcrypt", action="store_true", help="verify passwords on the event loop (old behaviour)")
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--reset", action="store_true", help="allow dropping and recreating the tables of --database-url")
+    args = parser.parse_args()
+
+    require_reset(args.database_url, args.reset)
+    use_benchmark_database(args.database_url)
+    from backend.database import engine
+
+    # Fresh tables, so the benchmark user is created with the benchmark password
+    recreate_tables(engine)
+    print(json.dumps(asyncio.run(run(args)), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
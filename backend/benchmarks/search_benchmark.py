@@ -0,0 +1,71 @@
+"""
+Compares /prompts/search's full-text index against a naive ILIKE '%q%' scan.
+
+Builds a throwaway database with N prompts from the synthetic dataset generator,
+then times the same queries through both paths. SQLite is used unless
+--database-url points elsewhere; an existing database's tables are only dropped
+and reseeded with --reset.
+
+    python -m backend.benchmarks.search_benchmark --prompts 100000
+    python -m backend.benchmarks.search_benchmark --database-url postgresql://... --reset
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.benchmarks.common import percentiles, recreate_tables, require_reset
+from backend.benchmarks.dataset import generate
+from backend.database import normalize_database_url
+from backend.search import search_prompts_ilike, search_prompts, setup_search
+
+
+def _time(fn, queries, repeat):
+    samples = []
+    for _ in range(repeat):
+        for q in queries:
+            started = time.perf_counter()
+            fn(q)
+            samples.append((time.perf_counter() - started) * 1000)
+    return percentiles(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--prompts", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--reset", action="store_true", help="allow dropping and reseeding the tables of --database-url")
+    args = parser.parse_args()
+
+    require_reset(args.database_url, args.reset)
+    url = args.database_url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "search_bench.db")
+    engine = create_engine(normalize_database_url(url))
+    recreate_tables(engine)
+
+    seeded = generate(engine, args.users, args.prompts, feedback=0)
+    # Built once after the load instead of by per-row triggers
+    setup_search(engine)
+    print(f"--- Seeded {seeded['prompts']} prompts in {seeded['seconds']}s ---")
+
+    queries = ["통계", "베이즈 정리", "현금흐름", "대기행렬 시뮬레이션", "없는단어"]
+    db = sessionmaker(bind=engine)()
+    results = {
+        "dialect": engine.dialect.name,
+        "prompts": args.prompts,
+        "queries": queries,
+        "fulltext": _time(lambda q: search_prompts(db, q, args.limit), queries, args.repeat),
+        "ilike": _time(lambda q: search_prompts_ilike(db, q, args.limit, None), queries, args.repeat),
+    }
+    db.close()
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compares the old and new ways of serializing prompt listings, without a database.
+
+Before: a model per row with from_orm (build_response_prompts), which FastAPI then
+validates against response_model again and encodes with json.dumps. After: plain row
+dicts validated once by a cached TypeAdapter and written to bytes by pydantic-core
+(validated_list_response). Both paths get the same ORM objects, and the bodies are
+checked to decode to the same data.
+
+    python -m backend.benchmarks.serialization_benchmark --rows 100 1000
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from backend import schemas
+from backend.benchmarks.common import percentiles
+from backend.database import Prompt, User
+from backend.prompt_responses import FULL_FIELDS, SUMMARY_FIELDS, build_response_prompts, prompt_rows
+from backend.serialization import validated_list_response
+
+SCHEMAS = {"summary": (schemas.PromptSummary, SUMMARY_FIELDS), "full": (schemas.Prompt, FULL_FIELDS)}
+
+
+def make_prompts(count: int) -> List[Prompt]:
+    owner = User(id=1, name="김민서")
+    start = datetime(2024, 1, 1)
+    return [
+        Prompt(
+            id=i, title=f"확률통계 과제 프롬프트 {i}",
+            content="## 과제 설명\n\n베이즈 정리를 단계별로 설명해줘. 예제와 함께 정리해줘.\n" * (1 + i % 8),
+            subject="확률통계", created_at=start + timedelta(minutes=i), owner_id=1, owner=owner,
+            views=i * 7, likes=i % 13, dislikes=i % 3,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def before(route: APIRoute, schema, prompts, feedback_by_prompt) -> bytes:
+    content = build_response_prompts(prompts, feedback_by_prompt, schema=schema)
+    # What FastAPI does with an endpoint's return value: validate against response_model, then encode
+    serialized = asyncio.run(serialize_response(field=route.response_field, response_content=content))
+    return JSONResponse(serialized).body
+
+
+def after(schema, fields, prompts, feedback_by_prompt) -> bytes:
+    return validated_list_response(Response(), schema, prompt_rows(prompts, fields, feedback_by_prompt)).body
+
+
+def _time(fn, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return percentiles(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    results = []
+    for name, (schema, fields) in SCHEMAS.items():
+        route = APIRoute("/", lambda: None, response_model=List[schema])
+        for rows in args.rows:
+            prompts = make_prompts(rows)
+            feedback_by_prompt = {p.id: "like" for p in prompts[::5]}
+            old_body = before(route, schema, prompts, feedback_by_prompt)
+            new_body = after(schema, fields, prompts, feedback_by_prompt)
+            if json.loads(old_body) != json.loads(new_body):
+                raise SystemExit(f"{name}/{rows}: the two paths produced different JSON")
+            old = _time(lambda: before(route, schema, prompts, feedback_by_prompt), args.repeat)
+            new = _time(lambda: after(schema, fields, prompts, feedback_by_prompt), args.repeat)
+            results.append({
+                "schema": name, "rows": rows, "bytes": len(new_body),
+                "before": old, "after": new, "speedup": round(old["mean_ms"] / new["mean_ms"], 2),
+            })
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
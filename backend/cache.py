@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Every cache registers itself here so its counters can be reported
+caches: Dict[str, "TTLCache"] = {}
+
+# Per-key invalidations remembered for in-flight loads; older ones are folded into a
+# cache-wide floor, which only makes stale-load detection more conservative
+INVALIDATION_HISTORY = 1024
+
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache. Entries expire `ttl` seconds after they
+    were loaded and can be dropped early with `invalidate`. With `maxsize` set,
+    the least recently used entry is evicted once the cache is full. Hits and
+    misses are counted so the hit ratio can be reported.
+    """
+
+    def __init__(self, name: str, ttl: float, maxsize: Optional[int] = None):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        # Bumped by every invalidation. A load remembers the generation it started at and
+        # is only stored if neither its key nor the whole cache was invalidated since.
+        self._generation = 0
+        self._cleared_at = 0
+        self._invalidated: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        caches[name] = self
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for `key`, calling `loader` to fill it on a miss
+        or after expiry. A loader result of None is returned but not cached.
+        """
+        hit, value, generation = self._lookup(key)
+        if hit:
+            return value
+        value = loader()
+        self._store(key, value, generation)
+        return value
+
+    async def get_or_load_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Same as get_or_load, for a coroutine loader."""
+        hit, value, generation = self._lookup(key)
+        if hit:
+            return value
+        value = await loader()
+        self._store(key, value, generation)
+        return value
+
+    def get(self, key: Hashable) -> Any:
+        """Returns the cached value for `key`, or None if it is missing or expired."""
+        return self._lookup(key)[1]
+
+    def put(self, key: Hashable, value: Any):
+        """Stores `value` for `key`, replacing any current entry."""
+        with self._lock:
+            self._insert(key, value)
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any, int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return True, entry[0], self._generation
+            self.misses += 1
+            return False, None, self._generation
+
+    def _store(self, key: Hashable, value: Any, generation: int):
+        with self._lock:
+            # Don't store a value that was loaded before an invalidation of its key
+            stale = generation < self._cleared_at or self._invalidated.get(key, 0) > generation
+            if value is not None and not stale:
+                self._insert(key, value)
+
+    def _insert(self, key: Hashable, value: Any):
+        # Caller holds the lock
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        if self.maxsize is not None and len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable = None):
+        """Drops one entry, or every entry when no key is given."""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+                self._invalidated.clear()
+                self._cleared_at = self._generation
+                return
+            self._entries.pop(key, None)
+            self._invalidated.pop(key, None)
+            self._invalidated[key] = self._generation
+            if len(self._invalidated) > INVALIDATION_HISTORY:
+                _, oldest = self._invalidated.popitem(last=False)
+                self._cleared_at = max(self._cleared_at, oldest)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+            }
+
+
+def cache_stats() -> List[dict]:
+    return [cache.stats() for cache in caches.values()]
+
+
+# Schools and subjects change only when an admin adds one
+reference_cache = TTLCache("reference_data", ttl=float(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "300")))
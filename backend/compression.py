@@ -0,0 +1,178 @@
+import gzip
+import os
+from typing import Callable, Dict, Hashable, Iterable, Optional
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+
+from backend.cache import TTLCache
+from backend.serialization import FastJSONResponse
+
+# Optional encoders: brotli and zstd are offered only when their package is installed
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Responses smaller than this are sent as they are; compressing them saves too little
+MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# Levels for responses compressed per request, and for cached responses compressed once
+DYNAMIC_LEVELS = {
+    "gzip": int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+    "br": int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4")),
+    "zstd": int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3")),
+}
+PRECOMPRESSED_LEVELS = {"gzip": 9, "br": 11, "zstd": 19}
+
+_ENCODERS: Dict[str, Callable[[bytes, int], bytes]] = {
+    # mtime=0 keeps the output identical for identical input
+    "gzip": lambda data, level: gzip.compress(data, compresslevel=level, mtime=0),
+}
+if brotli is not None:
+    _ENCODERS["br"] = lambda data, level: brotli.compress(data, quality=level)
+if zstandard is not None:
+    _ENCODERS["zstd"] = lambda data, level: zstandard.ZstdCompressor(level=level).compress(data)
+
+# Server preference among the encodings a client accepts equally, e.g. "br,zstd,gzip"
+ENCODINGS = tuple(
+    name for name in (item.strip() for item in os.getenv("COMPRESSION_ENCODINGS", "br,zstd,gzip").split(","))
+    if name in _ENCODERS
+)
+
+_COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml", "image/svg+xml")
+
+
+def negotiate(accept_encoding: str, available: Iterable[str] = ENCODINGS) -> Optional[str]:
+    """
+    Picks the encoding for a request's Accept-Encoding header: the highest q-value
+    among `available`, ties broken by the order of `available`. None means identity.
+    """
+    weights = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    return _ENCODERS[encoding](data, DYNAMIC_LEVELS[encoding] if level is None else level)
+
+
+def _vary_on_encoding(headers: MutableHeaders):
+    vary = [token.strip().lower() for token in headers.get("vary", "").split(",")]
+    if "accept-encoding" not in vary:
+        headers.add_vary_header("Accept-Encoding")
+
+
+def _compressible(headers: MutableHeaders) -> bool:
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(_COMPRESSIBLE_TYPES) or "+json" in content_type
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies of at least COMPRESSION_MIN_SIZE bytes with the best
+    encoding the client accepts (gzip, plus br/zstd when available). Responses that
+    already carry a Content-Encoding (see precompressed_response), streamed
+    responses and non-text content types are passed through unchanged.
+    """
+
+    def __init__(self, app, minimum_size: int = MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ENCODINGS:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        start = None
+
+        async def send_compressed(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether compression applies
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            response_start, start = start, None
+            headers = MutableHeaders(scope=response_start)
+            body = message.get("body", b"")
+            compressible = _compressible(headers)
+            # A 304 has no body to compress, but it stands for a 200 that varies by encoding
+            if compressible or response_start["status"] == 304:
+                _vary_on_encoding(headers)
+            if (
+                encoding is None or not compressible or "content-encoding" in headers
+                or message.get("more_body", False) or len(body) < self.minimum_size
+            ):
+                await send(response_start)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            if len(compressed) < len(body):
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(compressed))
+                body = compressed
+            await send(response_start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+class PrecompressedBody:
+    """A response body plus its compressed variants, each encoded once at the highest level."""
+
+    def __init__(self, body: bytes):
+        self.variants: Dict[Optional[str], bytes] = {None: body}
+        if len(body) >= MIN_SIZE:
+            for encoding in ENCODINGS:
+                compressed = compress(body, encoding, PRECOMPRESSED_LEVELS[encoding])
+                if len(compressed) < len(body):
+                    self.variants[encoding] = compressed
+
+
+# Rendered and compressed bodies of cached responses, keyed by path and ETag, so a
+# new version gets a new entry and old ones age out
+precompressed_cache = TTLCache(
+    "precompressed_responses",
+    ttl=float(os.getenv("PRECOMPRESSED_CACHE_TTL_SECONDS", "300")),
+    maxsize=int(os.getenv("PRECOMPRESSED_CACHE_MAX_ENTRIES", "256")),
+)
+
+
+def precompressed_response(request: Request, response: Response, key: Hashable, render: Callable[[], bytes]) -> Response:
+    """
+    Serves the JSON body `render()` produces for `key` (typically the ETag), rendering
+    and compressing it only on the first request for that key. Headers already set on
+    `response` are kept; CompressionMiddleware leaves the result alone.
+    """
+    body = precompressed_cache.get_or_load((request.url.path, key), lambda: PrecompressedBody(render()))
+    encoding = negotiate(request.headers.get("accept-encoding", ""), [e for e in ENCODINGS if e in body.variants])
+    result = FastJSONResponse(body.variants[encoding], headers=dict(response.headers))
+    _vary_on_encoding(result.headers)
+    if encoding is not None:
+        result.headers["Content-Encoding"] = encoding
+    return result
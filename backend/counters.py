@@ -0,0 +1,252 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import case, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from backend.database import Prompt, PromptFeedback, SessionLocal
+
+# Counter columns returned after every increment
+COUNTER_COLUMNS = (Prompt.views, Prompt.likes, Prompt.dislikes)
+
+
+def increment_prompt_counters(db: Session, prompt_id: int, **deltas: int) -> Optional[Row]:
+    """
+    Adds the given deltas (views=, likes=, dislikes=) to a prompt in a single
+    `UPDATE prompts SET likes = likes + :n ...` statement, so concurrent requests
+    never lose updates. Returns the fresh (views, likes, dislikes) row, or None if
+    the prompt does not exist. Uses RETURNING where the dialect supports it.
+    """
+    values = {name: getattr(Prompt, name) + delta for name, delta in deltas.items() if delta}
+    if not values:
+        return db.execute(select(*COUNTER_COLUMNS).where(Prompt.id == prompt_id)).first()
+
+    stmt = (
+        update(Prompt)
+        .where(Prompt.id == prompt_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if db.get_bind().dialect.update_returning:
+        return db.execute(stmt.returning(*COUNTER_COLUMNS)).first()
+
+    if db.execute(stmt).rowcount == 0:
+        return None
+    return db.execute(select(*COUNTER_COLUMNS).where(Prompt.id == prompt_id)).first()
+
+
+def apply_feedback_toggle(db: Session, prompt_id: int, user_id: int, feedback_type: str) -> Tuple[dict, Optional[str]]:
+    """
+    Applies a like/dislike toggle to the user's feedback row and returns the
+    counter deltas it implies plus the user's resulting feedback type.
+    Every step is a conditional write whose rowcount decides the deltas, so the
+    counters stay consistent with prompt_feedback under concurrent toggles.
+    May raise IntegrityError if a concurrent request inserted the row first.
+    """
+    counter = "likes" if feedback_type == "like" else "dislikes"
+    other = "dislikes" if feedback_type == "like" else "likes"
+    deltas = {"likes": 0, "dislikes": 0}
+
+    user_feedback = db.query(PromptFeedback).filter(
+        PromptFeedback.user_id == user_id,
+        PromptFeedback.prompt_id == prompt_id
+    )
+
+    # Same feedback again: the user is toggling it off
+    if user_feedback.filter(PromptFeedback.feedback_type == feedback_type).delete(synchronize_session=False):
+        deltas[counter] -= 1
+        return deltas, None
+
+    # Opposite feedback exists: switch it over
+    if user_feedback.filter(PromptFeedback.feedback_type != feedback_type).update(
+        {PromptFeedback.feedback_type: feedback_type}, synchronize_session=False
+    ):
+        deltas[counter] += 1
+        deltas[other] -= 1
+        return deltas, feedback_type
+
+    # No feedback yet: create it
+    db.add(PromptFeedback(user_id=user_id, prompt_id=prompt_id, feedback_type=feedback_type))
+    db.flush()
+    deltas[counter] += 1
+    return deltas, feedback_type
+
+
+class ViewCounterBuffer:
+    """
+    Write-behind buffer for prompt views. Views are accumulated per prompt_id in
+    memory and written in one batched UPDATE, either every `flush_interval`
+    seconds by a background thread or as soon as `max_pending` views are queued.
+    The buffer is per process, so with several workers each one flushes its own
+    deltas. A `flush_interval` of 0 or less writes every view through immediately.
+    """
+
+    def __init__(self, flush_interval: float, max_pending: int):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[int, int] = {}
+        self._pending_total = 0
+        self._flushing: Dict[int, int] = {}
+        # Bumped when a flush starts writing and again when it is done, so it is odd while
+        # one is in progress; readers use it to detect a flush racing with their own read
+        self._flush_sequence = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, prompt_id: int, count: int = 1):
+        with self._lock:
+            self._pending[prompt_id] = self._pending.get(prompt_id, 0) + count
+            self._pending_total += count
+            full = self._pending_total >= self.max_pending
+
+        if self.flush_interval <= 0 or self._thread is None:
+            self.flush()
+        elif full:
+            self._wake.set()
+
+    def pending(self, prompt_id: int) -> int:
+        """Returns the views recorded for a prompt that have not been flushed yet."""
+        with self._lock:
+            return self._pending.get(prompt_id, 0) + self._flushing.get(prompt_id, 0)
+
+    def pending_snapshot(self, prompt_id: int) -> Tuple[int, int]:
+        """Returns (flush sequence, pending views of the prompt), read together."""
+        with self._lock:
+            return self._flush_sequence, self._pending.get(prompt_id, 0) + self._flushing.get(prompt_id, 0)
+
+    def flush_sequence(self) -> int:
+        with self._lock:
+            return self._flush_sequence
+
+    def wait_for_flush(self):
+        """Blocks until the flush in progress, if any, has finished."""
+        with self._flush_lock:
+            pass
+
+    def flush(self):
+        """Writes all buffered views to the database in a single UPDATE."""
+        with self._flush_lock:
+            with self._lock:
+                deltas, self._pending, self._pending_total = self._pending, {}, 0
+                if not deltas:
+                    return
+                self._flushing = deltas
+                self._flush_sequence += 1
+
+            db = SessionLocal()
+            try:
+                db.execute(
+                    update(Prompt)
+                    .where(Prompt.id.in_(deltas.keys()))
+                    .values(views=Prompt.views + case(deltas, value=Prompt.id, else_=0))
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                # Put the deltas back so they are retried on the next flush
+                with self._lock:
+                    for prompt_id, count in deltas.items():
+                        self._pending[prompt_id] = self._pending.get(prompt_id, 0) + count
+                        self._pending_total += count
+                print(f"--- Failed to flush {len(deltas)} buffered view counts: {e} ---")
+            finally:
+                with self._lock:
+                    self._flushing = {}
+                    self._flush_sequence += 1
+                db.close()
+
+    def start(self):
+        if self.flush_interval <= 0 or self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="view-counter-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the background thread and flushes whatever is still buffered."""
+        if self._thread is not None:
+            self._stopped.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+view_buffer = ViewCounterBuffer(
+    flush_interval=float(os.getenv("VIEW_FLUSH_INTERVAL_SECONDS", "5")),
+    max_pending=int(os.getenv("VIEW_FLUSH_MAX_PENDING", "1000")),
+)
+
+
+def counters_with_pending(db: Session, prompt_id: int) -> Optional[Tuple[int, int, int]]:
+    """
+    Returns a prompt's (views, likes, dislikes) with this process's buffered views added,
+    or None if the prompt does not exist. A flush moves views from the buffer into the row,
+    so if one runs while the row is read, the read is retried to count those views once.
+    """
+    while True:
+        sequence, pending = view_buffer.pending_snapshot(prompt_id)
+        if sequence % 2:
+            view_buffer.wait_for_flush()
+            continue
+        counters = db.execute(select(*COUNTER_COLUMNS).where(Prompt.id == prompt_id)).first()
+        if view_buffer.flush_sequence() == sequence:
+            break
+        # End the read transaction so the retry sees what the flush committed
+        db.rollback()
+
+    if counters is None:
+        return None
+    views, likes, dislikes = counters
+    return views + pending, likes, dislikes
+
+
+class RecentViews:
+    """
+    Remembers which (user, prompt) pairs were viewed within the last `window`
+    seconds, so refreshing a prompt does not count as a new view. Entries are
+    kept in insertion order and expired from the front; at most `max_entries`
+    are held in memory.
+    """
+
+    def __init__(self, window: float, max_entries: int):
+        self.window = window
+        self.max_entries = max_entries
+        self._seen: "OrderedDict[Tuple[int, int], float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def first_view(self, user_id: int, prompt_id: int) -> bool:
+        """Records a view and returns True unless the same user viewed the prompt within the window."""
+        now = time.monotonic()
+        key = (user_id, prompt_id)
+        with self._lock:
+            while self._seen:
+                seen_at = next(iter(self._seen.values()))
+                if now - seen_at < self.window and len(self._seen) < self.max_entries:
+                    break
+                self._seen.popitem(last=False)
+
+            if key in self._seen:
+                return False
+            self._seen[key] = now
+            return True
+
+
+recent_views = RecentViews(
+    window=float(os.getenv("VIEW_DEDUPE_WINDOW_SECONDS", "600")),
+    max_entries=int(os.getenv("VIEW_DEDUPE_MAX_ENTRIES", "100000")),
+)
@@ -1,34 +1,95 @@
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, ForeignKey, Text
-from sqlalchemy.orm import sessionmaker, declarative_base, relationship
+from sqlalchemy import create_engine, make_url, inspect, select, update, bindparam, Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Index
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import sessionmaker, declarative_base, relationship, validates
 from sqlalchemy.schema import UniqueConstraint
 from datetime import datetime
 import os
 
+from backend.excerpt import make_excerpt
+from backend.pool import pool_options
+from backend.sqlite_tuning import SingleWriter, configure_sqlite
+
 # --- Database Configuration ---
 # Check for a production DATABASE_URL environment variable (from Render, etc.)
 # If it exists, use it. Otherwise, fall back to a local SQLite database.
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 
-# For production PostgreSQL on services like Render, the URL might start with "postgres://"
-# but SQLAlchemy 1.4+ requires "postgresql://".
-if SQLALCHEMY_DATABASE_URL and SQLALCHEMY_DATABASE_URL.startswith("postgres://"):
-    SQLALCHEMY_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("postgres://", "postgresql://", 1)
+def normalize_database_url(url: str) -> str:
+    # For production PostgreSQL on services like Render, the URL might start with "postgres://"
+    # but SQLAlchemy 1.4+ requires "postgresql://".
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql://", 1)
+    return url
+
+def make_engine(url: str):
+    """Creates an engine for the primary or a replica with the configured pool settings."""
+    if make_url(url).get_backend_name() == "sqlite":
+        # The 'check_same_thread' argument is specific to SQLite
+        sqlite_engine = create_engine(url, connect_args={"check_same_thread": False}, **pool_options())
+        # WAL and the other pragmas are applied to every SQLite connection (see backend/sqlite_tuning.py)
+        configure_sqlite(sqlite_engine)
+        return sqlite_engine
+    # Pool size, overflow, timeout, recycle and pre-ping come from DB_POOL_* variables (see backend/pool.py)
+    return create_engine(url, **pool_options())
 
 # If no production URL is found, use local SQLite
 if not SQLALCHEMY_DATABASE_URL:
     print("--- No DATABASE_URL found, falling back to SQLite ---")
     SQLALCHEMY_DATABASE_URL = "sqlite:///./sql_app.db"
-    # The 'check_same_thread' argument is specific to SQLite
-    engine = create_engine(
-        SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-    )
 else:
     print("--- DATABASE_URL found, connecting to production database ---")
-    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    SQLALCHEMY_DATABASE_URL = normalize_database_url(SQLALCHEMY_DATABASE_URL)
+engine = make_engine(SQLALCHEMY_DATABASE_URL)
 
 # Create a SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# --- Read replicas ---
+# DATABASE_REPLICA_URLS is a comma-separated list of read-only copies of the primary.
+# Read-only endpoints get their session from backend.routing.get_read_db, which picks a
+# replica; everything else, and every write, goes to the primary through SessionLocal.
+DATABASE_REPLICA_URLS = [
+    normalize_database_url(url.strip()) for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+]
+if DATABASE_REPLICA_URLS:
+    print(f"--- {len(DATABASE_REPLICA_URLS)} read replica(s) configured ---")
+replica_engines = [make_engine(url) for url in DATABASE_REPLICA_URLS]
+ReplicaSessions = [sessionmaker(autocommit=False, autoflush=False, bind=replica) for replica in replica_engines]
+
+# --- SQLite production mode ---
+# SQLITE_SINGLE_WRITER=1 funnels the hot write paths through one writer thread.
+single_writer = None
+if engine.dialect.name == "sqlite":
+    if os.getenv("SQLITE_SINGLE_WRITER", "").lower() in ("1", "true", "yes", "on"):
+        single_writer = SingleWriter(SQLALCHEMY_DATABASE_URL, max_batch=int(os.getenv("SQLITE_WRITER_MAX_BATCH", "64")))
+
+# --- Optional async engine ---
+# DB_MODE=async serves the hot read endpoints through an AsyncSession (aiosqlite / asyncpg)
+# so their throughput can be compared with the default sync path. Startup and writes keep
+# using the sync engine above.
+DB_MODE = os.getenv("DB_MODE", "sync")
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+def to_async_url(url: str):
+    async_url = make_url(url)
+    async_url = async_url.set(drivername=ASYNC_DRIVERS.get(async_url.get_backend_name(), async_url.drivername))
+    # asyncpg takes 'ssl' instead of libpq's 'sslmode'
+    if async_url.get_backend_name() == "postgresql" and "sslmode" in async_url.query:
+        async_url = async_url.update_query_dict({"ssl": async_url.query["sslmode"]}).difference_update_query(["sslmode"])
+    return async_url
+
+async_engine = None
+AsyncSessionLocal = None
+if DB_MODE == "async":
+    # Imported here so aiosqlite/asyncpg are only needed in async mode
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    print("--- DB_MODE=async, hot endpoints use the async engine ---")
+    async_engine = create_async_engine(to_async_url(SQLALCHEMY_DATABASE_URL), **pool_options(async_engine=True))
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine.dialect.name == "sqlite":
+        configure_sqlite(async_engine.sync_engine)
+
 # Create a Base class for declarative models
 Base = declarative_base()
 
@@ -47,14 +108,28 @@ class Prompt(Base):
     views = Column(Integer, default=0)
     likes = Column(Integer, default=0)
     dislikes = Column(Integer, default=0)
+    # Plain-text preview for listings, kept in sync with content by _update_excerpt
+    excerpt = Column(String, nullable=True)
 
     owner = relationship("User", back_populates="prompts")
     feedback = relationship("PromptFeedback", back_populates="prompt")
 
+    # Composite indexes backing keyset pagination (newest first), overall and per filter
+    __table_args__ = (
+        Index("ix_prompts_created_at_id", "created_at", "id"),
+        Index("ix_prompts_subject_created_at_id", "subject", "created_at", "id"),
+        Index("ix_prompts_owner_created_at_id", "owner_id", "created_at", "id"),
+    )
+
     @hybrid_property
     def author(self):
         return self.owner.name
 
+    @validates("content")
+    def _update_excerpt(self, key, content):
+        self.excerpt = make_excerpt(content)
+        return content
+
 # Define the PromptFeedback model
 class PromptFeedback(Base):
     __tablename__ = "prompt_feedback"
@@ -109,7 +184,9 @@ class Subject(Base):
     name = Column(String, unique=True, index=True, nullable=False)
 
 
-# Function to get a database session
+# Function to get a database session. Endpoints depend on it with scope="function", so
+# the session is closed and its connection returned to the pool as soon as the endpoint
+# returns, not after the response has been sent (see backend/pool.py).
 def get_db():
     db = SessionLocal()
     try:
@@ -117,6 +194,73 @@ def get_db():
     finally:
         db.close()
 
+def run_write(db, fn):
+    """
+    Runs fn(session) as a committed write: on the single SQLite writer thread when it
+    is enabled (fn then gets the writer's session), otherwise on `db`.
+    """
+    if single_writer is not None:
+        return single_writer.submit(fn)
+    result = fn(db)
+    db.commit()
+    return result
+
+# Async counterpart of get_db, only available with DB_MODE=async
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Create tables in the database
 def create_db_and_tables():
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so add newer indexes explicitly
+    for index in Prompt.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    # ... and newer columns. Only the worker that adds the column fills it for existing rows;
+    # rows written afterwards get their excerpt from _update_excerpt.
+    if add_column_once("prompts", "excerpt", "VARCHAR"):
+        backfill_excerpts()
+
+def add_column_once(table: str, column: str, ddl_type: str) -> bool:
+    """
+    Adds a column unless it already exists, tolerating other workers adding it at the
+    same time. Returns True only when this call added it.
+    """
+    def exists():
+        return column in {c["name"] for c in inspect(engine).get_columns(table)}
+
+    if exists():
+        return False
+    try:
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}")
+    except DBAPIError:
+        # Duplicate column: another worker won the race
+        if exists():
+            return False
+        raise
+    return True
+
+def backfill_excerpts(batch_size: int = 1000):
+    """
+    Fills prompts.excerpt for rows written before the column existed, one committed batch
+    at a time. Startup runs it once, right after adding the column; if that was interrupted,
+    finish it by hand with `python -c "from backend.database import backfill_excerpts; backfill_excerpts()"`.
+    """
+    missing = (
+        select(Prompt.id, Prompt.content)
+        .where(Prompt.excerpt.is_(None), Prompt.content.is_not(None))
+        .order_by(Prompt.id)
+        .limit(batch_size)
+    )
+    set_excerpt = update(Prompt.__table__).where(Prompt.__table__.c.id == bindparam("prompt_id")).values(excerpt=bindparam("excerpt"))
+    filled = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(missing).all()
+            if not rows:
+                break
+            conn.execute(set_excerpt, [{"prompt_id": prompt_id, "excerpt": make_excerpt(content)} for prompt_id, content in rows])
+        filled += len(rows)
+    if filled:
+        print(f"--- Filled excerpts of {filled} existing prompts ---")
@@ -0,0 +1,46 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+# Headers copied from the would-be 200 response onto a 304 reply
+_NOT_MODIFIED_HEADERS = ("etag", "cache-control", "vary", "x-next-cursor")
+
+
+def make_etag(version: Any) -> str:
+    """
+    Builds a weak ETag from a cheap version value (counters, ids, a cached
+    payload...) rather than from the serialized body. Weak because the same
+    representation may be sent compressed or not.
+    """
+    digest = hashlib.sha1(repr(version).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: ignore the W/ prefix on both sides
+    wanted = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == wanted:
+            return True
+    return False
+
+
+def check_etag(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Sets the ETag on the outgoing response and returns a 304 Not Modified
+    response when the client's If-None-Match already matches it, so the
+    endpoint can return early without building or serializing the body.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None or not _matches(if_none_match, etag):
+        return None
+    headers = {name: value for name, value in response.headers.items() if name in _NOT_MODIFIED_HEADERS}
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
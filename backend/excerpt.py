@@ -0,0 +1,34 @@
+import os
+import re
+from typing import Optional
+
+# Characters kept in prompts.excerpt, the plain-text preview shown in listings
+EXCERPT_LENGTH = int(os.getenv("PROMPT_EXCERPT_LENGTH", "160"))
+
+_CODE_FENCE = re.compile(r"^\s*(```|~~~).*$", re.MULTILINE)
+_LINE_MARKUP = re.compile(r"^\s{0,3}(#{1,6}\s+|>\s?|[-*+]\s+|\d+[.)]\s+)", re.MULTILINE)
+_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_INLINE_MARKUP = re.compile(r"(\*\*|__|\*|_|`|~~)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def make_excerpt(content: Optional[str], length: int = EXCERPT_LENGTH) -> Optional[str]:
+    """
+    Plain-text preview of Markdown `content`: headings, list markers, links and
+    emphasis are stripped, whitespace is collapsed, and the text is cut at a word
+    boundary with a trailing ellipsis when longer than `length` characters.
+    """
+    if content is None:
+        return None
+    text = _CODE_FENCE.sub("", content)
+    text = _LINE_MARKUP.sub("", text)
+    text = _LINK.sub(r"\1", text)
+    text = _INLINE_MARKUP.sub("", text)
+    text = _WHITESPACE.sub(" ", text).strip()
+    if len(text) <= length:
+        return text
+    cut = text[:length]
+    # Avoid cutting a word in half unless the first word alone is too long
+    if " " in cut and not text[length].isspace():
+        cut = cut[:cut.rindex(" ")]
+    return cut.rstrip() + "…"
@@ -0,0 +1,51 @@
+from typing import List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import joinedload, load_only, raiseload
+
+from backend import schemas
+from backend.database import Prompt, User
+
+# Sparse fieldsets: `?fields=id,title,likes` selects which prompt fields a response
+# carries. The SELECT list follows the request, so `content` is only read and the
+# owner only joined when they were asked for. The rows are built with
+# prompt_responses.prompt_rows and sent with serialization.json_response, since they
+# would not validate against the endpoint's response_model.
+
+# Every field of schemas.Prompt and schemas.PromptSummary
+PROMPT_FIELDS = tuple(dict.fromkeys([*schemas.Prompt.model_fields, *schemas.PromptSummary.model_fields]))
+
+# Fields that are not prompt columns
+_COMPUTED_FIELDS = {"author", "current_user_feedback"}
+
+# Always loaded: the primary key, the cursor sort key and the counters the ETag is built from
+_ALWAYS_LOADED = (Prompt.id, Prompt.created_at, Prompt.views, Prompt.likes, Prompt.dislikes)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Validates a comma-separated `fields` parameter. None means the endpoint's default representation."""
+    if fields is None:
+        return None
+    requested = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in requested if name not in PROMPT_FIELDS]
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown) or '(none given)'}. Available: {', '.join(PROMPT_FIELDS)}",
+        )
+    return requested
+
+
+def wants_feedback(fields: Optional[List[str]]) -> bool:
+    return fields is None or "current_user_feedback" in fields
+
+
+def prompt_load_options(fields: List[str]) -> tuple:
+    """Loader options selecting only the columns (and the owner join) `fields` needs."""
+    columns = {*_ALWAYS_LOADED, *(getattr(Prompt, name) for name in fields if name not in _COMPUTED_FIELDS)}
+    options = [load_only(*columns, raiseload=True)]
+    if "author" in fields:
+        options.append(joinedload(Prompt.owner).load_only(User.name, raiseload=True))
+    else:
+        options.append(raiseload(Prompt.owner))
+    return tuple(options)
@@ -0,0 +1,30 @@
+import bisect
+import threading
+from typing import Sequence
+
+
+class Histogram:
+    """
+    Thread-safe fixed-bucket histogram. `buckets` are ascending upper bounds; values
+    above the last bound land in an open-ended overflow bucket. Counts are per bucket
+    (not cumulative), with the total count and sum kept alongside.
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict:
+        """{"count", "sum", "counts"}, where counts[i] is the bucket ending at buckets[i] and the last is the overflow."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        return {"count": sum(counts), "sum": total, "counts": counts}
@@ -0,0 +1,184 @@
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from backend.histogram import Histogram
+
+logger = logging.getLogger("backend.timing")
+
+# Upper bounds (ms) of the per-route latency histogram buckets
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Requests above either budget are logged as warnings
+QUERY_BUDGET = int(os.getenv("REQUEST_QUERY_BUDGET", "20"))
+LATENCY_BUDGET_MS = float(os.getenv("REQUEST_LATENCY_BUDGET_MS", "1000"))
+
+
+class RequestQueries:
+    """SQL statements executed on behalf of the current request and the time spent in them."""
+
+    __slots__ = ("count", "db_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.db_ms = 0.0
+
+
+class StatementTotals:
+    """Process-wide count and duration of every SQL statement, in or out of a request."""
+
+    def __init__(self):
+        self.count = 0
+        self.db_ms = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, db_ms: float):
+        with self._lock:
+            self.count += 1
+            self.db_ms += db_ms
+
+
+statement_totals = StatementTotals()
+
+# Set by the middleware for the duration of a request. Threadpool calls copy the context,
+# so sync endpoints and dependencies count into the same object.
+current_queries: ContextVar[Optional[RequestQueries]] = ContextVar("current_queries", default=None)
+
+
+# Listening on the Engine class covers the primary, replicas, the SQLite writer and the
+# async engine's sync_engine alike. Statements outside a request (background flushes) only
+# count towards statement_totals.
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    db_ms = (time.perf_counter() - started) * 1000
+    statement_totals.add(db_ms)
+    queries = current_queries.get()
+    if queries is not None:
+        queries.count += 1
+        queries.db_ms += db_ms
+
+
+class RouteTiming:
+    """Aggregated timings of one route (method + path template) in this process."""
+
+    def __init__(self, method: str, route: str):
+        self.method = method
+        self.route = route
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.statuses: Dict[int, int] = {}
+        self.queries = 0
+        self.db_ms = 0.0
+        self.over_budget = 0
+        self._lock = threading.Lock()
+
+    def record(self, status: int, elapsed_ms: float, queries: RequestQueries, over_budget: bool):
+        self.latency_ms.observe(elapsed_ms)
+        with self._lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            self.queries += queries.count
+            self.db_ms += queries.db_ms
+            if over_budget:
+                self.over_budget += 1
+
+    def stats(self) -> dict:
+        latency = self.latency_ms.snapshot()
+        with self._lock:
+            statuses = dict(self.statuses)
+            queries, db_ms, over_budget = self.queries, self.db_ms, self.over_budget
+        requests = latency["count"]
+        return {
+            "method": self.method,
+            "route": self.route,
+            "requests": requests,
+            "statuses": {str(status): count for status, count in sorted(statuses.items())},
+            "latency_ms_total": latency["sum"],
+            "latency_histogram": [
+                {"le_ms": bound, "count": count} for bound, count in zip(self.latency_ms.buckets, latency["counts"])
+            ] + [{"le_ms": None, "count": latency["counts"][-1]}],
+            "queries_total": queries,
+            "queries_per_request": queries / requests if requests else 0.0,
+            "db_ms_total": db_ms,
+            "over_budget": over_budget,
+        }
+
+
+route_timings: Dict[Tuple[str, str], RouteTiming] = {}
+_route_timings_lock = threading.Lock()
+
+
+def _route_timing(method: str, route: str) -> RouteTiming:
+    key = (method, route)
+    timing = route_timings.get(key)
+    if timing is None:
+        with _route_timings_lock:
+            timing = route_timings.setdefault(key, RouteTiming(method, route))
+    return timing
+
+
+def route_stats() -> List[dict]:
+    return [timing.stats() for timing in list(route_timings.values())]
+
+
+def server_timing(elapsed_ms: float, queries: RequestQueries) -> str:
+    return f'app;dur={elapsed_ms:.1f}, db;dur={queries.db_ms:.1f};desc="{queries.count} queries"'
+
+
+class RequestTimingMiddleware:
+    """
+    Times every HTTP request and counts the SQL statements it ran. Adds a
+    Server-Timing header (total and DB time), aggregates per route, and logs a
+    warning when a request exceeds REQUEST_QUERY_BUDGET statements or
+    REQUEST_LATENCY_BUDGET_MS milliseconds.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+        token = current_queries.set(queries)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing((time.perf_counter() - started) * 1000, queries))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_queries.reset(token)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            # The router stores the matched route in the scope; its template keeps the label set small
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            over_budget = queries.count > QUERY_BUDGET or elapsed_ms > LATENCY_BUDGET_MS
+            _route_timing(scope["method"], route_path).record(status, elapsed_ms, queries, over_budget)
+            if over_budget:
+                logger.warning(
+                    "%s %s took %.1f ms with %d SQL statements (%.1f ms in the database); budget is %d statements / %.0f ms",
+                    scope["method"], scope["path"], elapsed_ms, queries.count, queries.db_ms, QUERY_BUDGET, LATENCY_BUDGET_MS,
+                )
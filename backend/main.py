@@ -1,14 +1,30 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta
 from typing import List, Optional
+import orjson
 
 from backend import database as models, schemas
-from backend.database import get_db, create_db_and_tables, School, Subject
-from backend.auth import get_password_hash, verify_password, create_access_token, verify_access_token, get_current_user_or_none
+from backend.database import get_db, create_db_and_tables, engine, run_write, single_writer, School, Subject
+from backend.auth import get_password_hash_async, verify_password_async, create_access_token, verify_access_token, get_current_user_or_none, get_user_by_username, invalidate_user
 from backend.schemas import School as SchemaSchool # Import School from schemas with an alias
+from backend.pagination import NEXT_CURSOR_HEADER, paginate_by_cursor
+from backend.counters import apply_feedback_toggle, counters_with_pending, increment_prompt_counters, view_buffer, recent_views
+from backend.stats import site_stats
+from backend.cache import reference_cache, cache_stats
+from backend.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, engine_pool_stats, metrics_text, worker_snapshots
+from backend.etag import check_etag, make_etag
+from backend.search import SEARCH_MAX_LIMIT, search_prompts, setup_search
+from backend.routing import get_read_db, mark_write
+from backend.instrumentation import RequestTimingMiddleware, route_stats
+from backend.prompt_responses import FULL_FIELDS, SUMMARY_FIELDS, SUMMARY_LOAD_OPTIONS, prompt_rows, prompt_version, subjects_map
+from backend.serialization import json_response, list_adapter, validated_list_response, validated_response
+from backend.compression import CompressionMiddleware, precompressed_response
+from backend.fieldsets import parse_fields, prompt_load_options, wants_feedback
 
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -21,41 +37,61 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Server-Timing"],
 )
 
+app.add_middleware(CompressionMiddleware)
+
+# Added last so it wraps everything else, including CORS and compression
+app.add_middleware(RequestTimingMiddleware)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # Dependency to get current user from token
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db, scope="function")):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     username = verify_access_token(token, credentials_exception)
-    user = db.query(models.User).filter(models.User.username == username).first()
+    user = get_user_by_username(db, username)
     if user is None:
         raise credentials_exception
     return user
 
+def cached_schools(db: Session) -> List[schemas.School]:
+    return reference_cache.get_or_load("schools", lambda: [schemas.School.from_orm(s) for s in db.query(School).all()])
+
+def cached_subjects(db: Session) -> List[schemas.Subject]:
+    return reference_cache.get_or_load("subjects", lambda: [schemas.Subject.from_orm(s) for s in db.query(Subject).all()])
+
 def create_school_if_not_exists(db: Session, school_name: str):
+    if any(s.name == school_name for s in cached_schools(db)):
+        print(f"--- School '{school_name}' already exists in database. ---")
+        return
     school = db.query(School).filter(School.name == school_name).first()
     if not school:
         new_school = School(name=school_name)
         db.add(new_school)
         db.commit()
         db.refresh(new_school)
+        reference_cache.invalidate("schools")
         print(f"--- School '{school_name}' added to database. ---")
     else:
         print(f"--- School '{school_name}' already exists in database. ---")
 
 def create_subject_if_not_exists(db: Session, subject_name: str):
+    if any(s.name == subject_name for s in cached_subjects(db)):
+        print(f"--- Subject '{subject_name}' already exists in database. ---")
+        return
     subject = db.query(Subject).filter(Subject.name == subject_name).first()
     if not subject:
         new_subject = Subject(name=subject_name)
         db.add(new_subject)
         db.commit()
         db.refresh(new_subject)
+        reference_cache.invalidate("subjects")
         print(f"--- Subject '{subject_name}' added to database. ---")
     else:
         print(f"--- Subject '{subject_name}' already exists in database. ---")
@@ -63,6 +99,7 @@ def create_subject_if_not_exists(db: Session, subject_name: str):
 @app.on_event("startup")
 def on_startup():
     create_db_and_tables()
+    setup_search(engine)
     print("Database tables created!")
     db = next(get_db()) # Get a database session
     create_school_if_not_exists(db, "전남대학교")
@@ -70,43 +107,119 @@ def on_startup():
     create_subject_if_not_exists(db, "경제성공학")
     create_subject_if_not_exists(db, "확률통계")
     db.close() # Close the session
+    if single_writer is not None:
+        single_writer.start()
+    view_buffer.start()
+    if worker_snapshots is not None:
+        worker_snapshots.start()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    # Write out any views still held in the buffer
+    view_buffer.stop()
+    if single_writer is not None:
+        single_writer.stop()
+    if worker_snapshots is not None:
+        worker_snapshots.stop()
 
 @app.get("/")
 def read_root():
     return {"Hello": "World"}
 
 
+# Cached responses below are served from precompressed bodies, keyed by their ETag
+
 @app.get("/schools/", response_model=List[schemas.School])
-def read_schools(db: Session = Depends(get_db)):
-    schools = db.query(models.School).all()
-    return schools
+def read_schools(request: Request, response: Response, db: Session = Depends(get_read_db, scope="function")):
+    schools = cached_schools(db)
+    etag = make_etag([(s.id, s.name) for s in schools])
+    not_modified = check_etag(request, response, etag)
+    return not_modified or precompressed_response(request, response, etag, lambda: list_adapter(schemas.School).dump_json(schools))
 
 
 @app.get("/subjects/", response_model=List[schemas.Subject])
-def read_subjects(db: Session = Depends(get_db)):
-    subjects = db.query(models.Subject).all()
-    return subjects
+def read_subjects(request: Request, response: Response, db: Session = Depends(get_read_db, scope="function")):
+    subjects = cached_subjects(db)
+    etag = make_etag([(s.id, s.name, s.school_id) for s in subjects])
+    not_modified = check_etag(request, response, etag)
+    return not_modified or precompressed_response(request, response, etag, lambda: list_adapter(schemas.Subject).dump_json(subjects))
 
 
+@app.get("/stats/cache", response_model=List[schemas.CacheStats])
+def get_cache_stats():
+    return cache_stats()
+
+# Per worker process, like the pool stats below
+@app.get("/stats/routes", response_model=List[schemas.RouteStats])
+def get_route_stats():
+    return route_stats()
+
+# Per worker process: each uvicorn worker has its own pool
+@app.get("/stats/pool", response_model=List[schemas.PoolStats])
+def get_pool_stats():
+    return engine_pool_stats()
+
+# Prometheus text format; summed across workers when METRICS_DIR is set
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return Response(content=metrics_text(), media_type=METRICS_CONTENT_TYPE)
+
 @app.get("/stats/prompts/count", response_model=int)
-def get_prompts_count(db: Session = Depends(get_db)):
-    return db.query(models.Prompt).count()
+def get_prompts_count(request: Request, response: Response, db: Session = Depends(get_read_db, scope="function")):
+    prompt_count = site_stats.summary(db)["prompt_count"]
+    etag = make_etag(prompt_count)
+    return check_etag(request, response, etag) or precompressed_response(request, response, etag, lambda: orjson.dumps(prompt_count))
 
 @app.get("/stats/prompts/total-likes", response_model=int)
-def get_total_likes(db: Session = Depends(get_db)):
-    total_likes = db.query(func.sum(models.Prompt.likes)).scalar()
-    return total_likes if total_likes is not None else 0
+def get_total_likes(request: Request, response: Response, db: Session = Depends(get_read_db, scope="function")):
+    total_likes = site_stats.summary(db)["total_likes"]
+    etag = make_etag(total_likes)
+    return check_etag(request, response, etag) or precompressed_response(request, response, etag, lambda: orjson.dumps(total_likes))
+
+@app.get("/stats/summary", response_model=schemas.StatsSummary)
+def get_stats_summary(request: Request, response: Response, db: Session = Depends(get_read_db, scope="function")):
+    summary = site_stats.summary(db)
+    etag = make_etag(sorted(summary.items()))
+    return check_etag(request, response, etag) or precompressed_response(request, response, etag, lambda: orjson.dumps(summary))
+
+def save_and_refresh(db: Session, obj):
+    """Inserts `obj` and returns it attached to `db` with its generated columns loaded."""
+    def insert(session: Session):
+        session.add(obj)
+        session.flush()
+        return obj
+
+    saved = run_write(db, insert)
+    if single_writer is None:
+        db.refresh(saved)
+        return saved
+    # Written by the writer thread's session; attach the already loaded copy to this one
+    return db.merge(saved, load=False)
+
+def query_and_release(db: Session, query):
+    """
+    Runs query() and then closes `db`, returning its connection to the pool before the
+    request goes on to wait for bcrypt. The result stays readable, detached from `db`.
+    """
+    try:
+        return query()
+    finally:
+        db.close()
 
 @app.post("/signup", response_model=schemas.UserResponse, status_code=status.HTTP_201_CREATED)
-def signup(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(or_(models.User.username == user.username, models.User.email == user.email)).first()
+async def signup(user: schemas.UserCreate, db: Session = Depends(get_db, scope="function")):
+    # Blocking database calls go to the threadpool and bcrypt to the password pool, keeping the event loop free
+    db_user = await run_in_threadpool(
+        query_and_release, db,
+        lambda: db.query(models.User).filter(or_(models.User.username == user.username, models.User.email == user.email)).first()
+    )
     if db_user:
         if db_user.username == user.username:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already registered")
         else:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     
     new_user = models.User(
         username=user.username,
@@ -119,18 +232,19 @@ def signup(user: schemas.UserCreate, db: Session = Depends(get_db)):
         studentId=user.studentId,
         created_at=datetime.utcnow()
     )
-    db.add(new_user)
-    db.commit()
+    new_user = await run_in_threadpool(save_and_refresh, db, new_user)
     print(f"--- User '{new_user.username}' with full profile committed to database. ---")
-    db.refresh(new_user)
     return new_user
 
 @app.post("/token", response_model=schemas.Token)
-async def login_for_access_token(login_data: schemas.UserLogin, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(
-        or_(models.User.username == login_data.username, models.User.email == login_data.username)
-    ).first()
-    if not user or not verify_password(login_data.password, user.hashed_password):
+async def login_for_access_token(login_data: schemas.UserLogin, db: Session = Depends(get_db, scope="function")):
+    user = await run_in_threadpool(
+        query_and_release, db,
+        lambda: db.query(models.User).filter(
+            or_(models.User.username == login_data.username, models.User.email == login_data.username)
+        ).first()
+    )
+    if not user or not await verify_password_async(login_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -148,145 +262,246 @@ async def read_users_me(current_user: models.User = Depends(get_current_user)):
 
 @app.get("/users/me/prompts", response_model=List[schemas.Prompt])
 def read_user_prompts(
-    db: Session = Depends(get_db),
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db, scope="function"),
     current_user: models.User = Depends(get_current_user)
 ):
-    user_prompts = db.query(models.Prompt).filter(models.Prompt.owner_id == current_user.id).all()
-    return user_prompts
+    selected = parse_fields(fields)
+    options = (joinedload(models.Prompt.owner),) if selected is None else prompt_load_options(selected)
+    query = db.query(models.Prompt).options(*options).filter(models.Prompt.owner_id == current_user.id)
+
+    # Cursor mode pages through the user's prompts; without it the first `limit` are returned
+    if cursor is not None:
+        user_prompts, next_cursor = paginate_by_cursor(query, cursor, limit)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    else:
+        user_prompts = query.limit(limit).all()
+
+    # This endpoint does not look up the user's own feedback on their prompts
+    if selected is not None:
+        return json_response(response, prompt_rows(user_prompts, selected, {}))
+    return validated_list_response(response, schemas.Prompt, prompt_rows(user_prompts, FULL_FIELDS, {}))
 
 @app.post("/prompts/", response_model=schemas.Prompt)
 def create_prompt(
+    response: Response,
     prompt: schemas.PromptCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
     current_user: models.User = Depends(get_current_user),
 ):
-    db_prompt = models.Prompt(**prompt.dict(), owner_id=current_user.id)
-    db.add(db_prompt)
-    db.commit()
-    db.refresh(db_prompt)
-    return db_prompt
-
-# Temporary map to resolve subject_id to name, mirroring lib/subjects.ts
-subjects_map = {
-    "1": "산업공학입문",
-    "2": "경제성공학",
-    "3": "확률통계",
-}
+    # Read before the commit expires current_user, which would reload it in a new transaction
+    username = current_user.username
+    db_prompt = save_and_refresh(db, models.Prompt(**prompt.dict(), owner_id=current_user.id))
+    site_stats.prompt_created()
+    mark_write(response, username)
+    # Serialized here, on this thread, while the session can still lazy-load the author
+    return validated_response(response, schemas.Prompt, db_prompt)
+
+def load_user_feedback(db: Session, prompts: List[models.Prompt], current_user: Optional[models.User]):
+    """Returns {prompt_id: feedback_type} for the current user, using a single lookup for the whole page."""
+    if not current_user or not prompts:
+        return {}
+    rows = db.query(models.PromptFeedback.prompt_id, models.PromptFeedback.feedback_type).filter(
+        models.PromptFeedback.user_id == current_user.id,
+        models.PromptFeedback.prompt_id.in_([p.id for p in prompts])
+    ).all()
+    return {prompt_id: feedback_type for prompt_id, feedback_type in rows}
 
-@app.get("/prompts/", response_model=List[schemas.Prompt])
+@app.get("/prompts/", response_model=List[schemas.PromptSummary])
 def read_prompts(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     subject_id: str | None = None,
-    db: Session = Depends(get_db),
+    cursor: str | None = None,
+    exact_views: bool = False,
+    fields: str | None = None,
+    db: Session = Depends(get_read_db, scope="function"),
     current_user: Optional[models.User] = Depends(get_current_user_or_none)
 ):
-    query = db.query(models.Prompt)
+    # Listing columns only (or the requested fields), with owners loaded in the same
+    # statement so `author` does not lazy-load a User per row
+    selected = parse_fields(fields)
+    query = db.query(models.Prompt).options(*(SUMMARY_LOAD_OPTIONS if selected is None else prompt_load_options(selected)))
 
     if subject_id and subject_id in subjects_map:
         subject_name = subjects_map[subject_id]
         query = query.filter(models.Prompt.subject == subject_name)
     
-    prompts = query.offset(skip).limit(limit).all()
-
-    # Manually populate current_user_feedback for each prompt
-    response_prompts = []
-    for db_prompt in prompts:
-        response_prompt = schemas.Prompt.from_orm(db_prompt)
-        if current_user:
-            user_feedback = db.query(models.PromptFeedback).filter(
-                models.PromptFeedback.user_id == current_user.id,
-                models.PromptFeedback.prompt_id == db_prompt.id
-            ).first()
-            response_prompt.current_user_feedback = user_feedback.feedback_type if user_feedback else None
-        response_prompts.append(response_prompt)
-        
-    return response_prompts
+    # Cursor mode seeks on (created_at, id) instead of scanning past `skip` rows
+    if cursor is not None:
+        prompts, next_cursor = paginate_by_cursor(query, cursor, limit)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    else:
+        prompts = query.offset(skip).limit(limit).all()
+
+    feedback_by_prompt = load_user_feedback(db, prompts, current_user) if wants_feedback(selected) else {}
+
+    # Answer 304 before building or serializing the page when the client already has it
+    response.headers["Vary"] = "Authorization"
+    etag = make_etag([prompt_version(p, feedback_by_prompt.get(p.id), exact_views) for p in prompts])
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    if selected is not None:
+        return json_response(response, prompt_rows(prompts, selected, feedback_by_prompt, exact_views))
+    return validated_list_response(response, schemas.PromptSummary, prompt_rows(prompts, SUMMARY_FIELDS, feedback_by_prompt, exact_views))
+
+# Upper bound on the ids one batch request may ask for
+PROMPT_BATCH_MAX_IDS = 100
+
+def parse_prompt_ids(ids: str) -> List[int]:
+    """Validates a comma-separated `ids` parameter, keeping the first occurrence of each id in request order."""
+    try:
+        requested = list(dict.fromkeys(int(item) for item in ids.split(",") if item.strip()))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ids must be a comma-separated list of integers")
+    if not requested or len(requested) > PROMPT_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"ids must name between 1 and {PROMPT_BATCH_MAX_IDS} prompts",
+        )
+    return requested
+
+# Several prompts by id in two queries (prompts with their owners, then the user's
+# feedback), instead of one GET /prompts/{prompt_id} per prompt. Ids that do not
+# exist are listed under `missing` rather than failing the whole batch.
+# Declared before /prompts/{prompt_id} so "batch" is not parsed as a prompt id
+@app.get("/prompts/batch", response_model=schemas.PromptBatch)
+def read_prompts_batch(
+    request: Request,
+    response: Response,
+    ids: str,
+    exact_views: bool = False,
+    fields: str | None = None,
+    db: Session = Depends(get_read_db, scope="function"),
+    current_user: Optional[models.User] = Depends(get_current_user_or_none)
+):
+    requested = parse_prompt_ids(ids)
+    selected = parse_fields(fields)
+    options = (joinedload(models.Prompt.owner),) if selected is None else prompt_load_options(selected)
+    found = {p.id: p for p in db.query(models.Prompt).options(*options).filter(models.Prompt.id.in_(requested)).all()}
+    prompts = [found[prompt_id] for prompt_id in requested if prompt_id in found]
+    missing = [prompt_id for prompt_id in requested if prompt_id not in found]
+
+    feedback_by_prompt = load_user_feedback(db, prompts, current_user) if wants_feedback(selected) else {}
+
+    response.headers["Vary"] = "Authorization"
+    etag = make_etag([[prompt_version(p, feedback_by_prompt.get(p.id), exact_views) for p in prompts], missing])
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    rows = prompt_rows(prompts, FULL_FIELDS if selected is None else selected, feedback_by_prompt, exact_views)
+    if selected is not None:
+        return json_response(response, {"prompts": rows, "missing": missing})
+    return validated_response(response, schemas.PromptBatch, {"prompts": rows, "missing": missing})
+
+# Declared before /prompts/{prompt_id} so "search" is not parsed as a prompt id
+@app.get("/prompts/search", response_model=List[schemas.PromptSearchResult])
+def search_prompts_endpoint(
+    response: Response,
+    q: str,
+    limit: int = Query(20, ge=1, le=SEARCH_MAX_LIMIT),
+    subject_id: str | None = None,
+    db: Session = Depends(get_read_db, scope="function"),
+):
+    subject_name = subjects_map.get(subject_id) if subject_id else None
+    return validated_list_response(response, schemas.PromptSearchResult, search_prompts(db, q, limit, subject_name))
 
 @app.get("/prompts/{prompt_id}", response_model=schemas.Prompt)
 def read_prompt(
+    request: Request,
+    response: Response,
     prompt_id: int, 
-    db: Session = Depends(get_db),
+    exact_views: bool = False,
+    fields: str | None = None,
+    db: Session = Depends(get_read_db, scope="function"),
     current_user: Optional[models.User] = Depends(get_current_user_or_none)
 ):
-    db_prompt = db.query(models.Prompt).filter(models.Prompt.id == prompt_id).first()
+    selected = parse_fields(fields)
+    options = (joinedload(models.Prompt.owner),) if selected is None else prompt_load_options(selected)
+    db_prompt = db.query(models.Prompt).options(*options).filter(models.Prompt.id == prompt_id).first()
     if db_prompt is None:
         raise HTTPException(status_code=404, detail="Prompt not found")
 
     # Check for current user's feedback
     user_feedback = None
-    if current_user: # Only query if current_user is authenticated
+    if current_user and wants_feedback(selected): # Only query if current_user is authenticated and the field is wanted
         user_feedback = db.query(models.PromptFeedback).filter(
             models.PromptFeedback.user_id == current_user.id,
             models.PromptFeedback.prompt_id == prompt_id
         ).first()
-    
-    # Create a schemas.Prompt instance and then set the current_user_feedback
-    response_prompt = schemas.Prompt.from_orm(db_prompt)
-    response_prompt.current_user_feedback = user_feedback.feedback_type if user_feedback else None
-    
-    return response_prompt
+
+    response.headers["Vary"] = "Authorization"
+    etag = make_etag(prompt_version(db_prompt, user_feedback.feedback_type if user_feedback else None, exact_views))
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    feedback_by_prompt = {prompt_id: user_feedback.feedback_type} if user_feedback else {}
+    if selected is not None:
+        return json_response(response, prompt_rows([db_prompt], selected, feedback_by_prompt, exact_views)[0])
+    return validated_response(response, schemas.Prompt, prompt_rows([db_prompt], FULL_FIELDS, feedback_by_prompt, exact_views)[0])
+
+FEEDBACK_TOGGLE_ATTEMPTS = 3
+
 @app.post("/prompts/{prompt_id}/feedback", response_model=schemas.Prompt)
 def give_prompt_feedback(
+    response: Response,
     prompt_id: int,
     feedback_data: schemas.PromptFeedbackBase,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
     current_user: models.User = Depends(get_current_user)
 ):
-    db_prompt = db.query(models.Prompt).filter(models.Prompt.id == prompt_id).first()
-    if db_prompt is None:
-        raise HTTPException(status_code=404, detail="Prompt not found")
-
-    existing_feedback = db.query(models.PromptFeedback).filter(
-        models.PromptFeedback.user_id == current_user.id,
-        models.PromptFeedback.prompt_id == prompt_id
-    ).first()
-
     feedback_type = feedback_data.feedback_type
 
     if feedback_type not in ["like", "dislike"]:
         raise HTTPException(status_code=400, detail="Invalid feedback type")
 
-    if existing_feedback:
-        if existing_feedback.feedback_type == feedback_type:
-            # User is toggling off their existing feedback (e.g., liked, clicks like again)
-            if feedback_type == "like":
-                db_prompt.likes -= 1
-            else:
-                db_prompt.dislikes -= 1
-            db.delete(existing_feedback)
-        else:
-            # User is changing feedback (e.g., liked, then dislikes)
-            if feedback_type == "like":
-                db_prompt.likes += 1
-                db_prompt.dislikes -= 1
-            else: # feedback_type == "dislike"
-                db_prompt.dislikes += 1
-                db_prompt.likes -= 1
-            existing_feedback.feedback_type = feedback_type
+    db_prompt = db.query(models.Prompt).options(joinedload(models.Prompt.owner)).filter(models.Prompt.id == prompt_id).first()
+    if db_prompt is None:
+        raise HTTPException(status_code=404, detail="Prompt not found")
+
+    # Built before the write, which commits and would expire db_prompt and current_user
+    response_prompt = schemas.Prompt.from_orm(db_prompt)
+    user_id, username = current_user.id, current_user.username
+
+    def toggle(session: Session):
+        deltas, current_feedback = apply_feedback_toggle(session, prompt_id, user_id, feedback_type)
+        # Counters are updated in SQL and the fresh values come back from the same statement
+        return deltas, current_feedback, increment_prompt_counters(session, prompt_id, **deltas)
+
+    for _ in range(FEEDBACK_TOGGLE_ATTEMPTS):
+        try:
+            deltas, current_feedback, counters = run_write(db, toggle)
+            break
+        except IntegrityError:
+            # A concurrent request created this user's feedback first; apply the toggle on top of it
+            db.rollback()
     else:
-        # No existing feedback, create new
-        if feedback_type == "like":
-            db_prompt.likes += 1
-        else:
-            db_prompt.dislikes += 1
-        
-        new_feedback = models.PromptFeedback(
-            user_id=current_user.id,
-            prompt_id=prompt_id,
-            feedback_type=feedback_type
-        )
-        db.add(new_feedback)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Feedback was changed concurrently, please retry")
 
-    db.commit()
-    db.refresh(db_prompt)
-    return db_prompt
+    response_prompt.views, response_prompt.likes, response_prompt.dislikes = counters
+    response_prompt.current_user_feedback = current_feedback
+    site_stats.likes_changed(deltas["likes"])
+    mark_write(response, username)
+    # With the single writer, `db` still holds the connection it read the prompt with
+    return validated_response(response, schemas.Prompt, response_prompt)
 
 
 @app.post("/users/bootstrap-admin", response_model=schemas.UserResponse, include_in_schema=False)
 def bootstrap_admin(
+    response: Response,
     user_action: schemas.UserAction,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
 ):
     # Check if any admin user already exists
     if db.query(models.User).filter(models.User.is_admin == True).first():
@@ -301,22 +516,35 @@ def bootstrap_admin(
 
     user_to_bootstrap.is_admin = True
     db.commit()
+    invalidate_user(user_to_bootstrap.username)
     db.refresh(user_to_bootstrap)
-    return user_to_bootstrap
+    return validated_response(response, schemas.UserResponse, user_to_bootstrap)
 
-@app.delete("/prompts/{prompt_id}", status_code=status.HTTP_200_OK)
+@app.post("/prompts/{prompt_id}/increment-view", response_model=schemas.PromptCounters)
 def increment_prompt_view(
-    prompt_id: int, 
-    db: Session = Depends(get_db),
+    response: Response,
+    prompt_id: int,
+    db: Session = Depends(get_db, scope="function"),
     current_user: models.User = Depends(get_current_user)
 ):
-    db_prompt = db.query(models.Prompt).filter(models.Prompt.id == prompt_id).first()
-    if db_prompt is None:
+    counters = counters_with_pending(db, prompt_id)
+    if counters is None:
         raise HTTPException(status_code=404, detail="Prompt not found")
-    
-    # Increment view count and commit
-    db_prompt.views += 1
-    db.commit()
-    db.refresh(db_prompt)
-    
-    return db_prompt
\ No newline at end of file
+
+    # Repeat views from the same user within the dedupe window are not counted again.
+    # Counted views are buffered and written later in a batched UPDATE, so viewers never wait
+    # on the row lock; the counters were read before this view, so it is added here
+    counted = 0
+    if recent_views.first_view(current_user.id, prompt_id):
+        view_buffer.add(prompt_id)
+        counted = 1
+
+    views, likes, dislikes = counters
+    return validated_response(response, schemas.PromptCounters, {
+        "id": prompt_id, "views": views + counted, "likes": likes, "dislikes": dislikes,
+    })
+
+# DB_MODE=async swaps the hot read endpoints above for their AsyncSession versions
+if models.DB_MODE == "async":
+    from backend.async_routes import use_async_routes
+    use_async_routes(app)
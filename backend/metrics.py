@@ -0,0 +1,210 @@
+import glob
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from backend import database
+from backend.auth import password_hash_ms, password_verify_ms
+from backend.cache import cache_stats
+from backend.instrumentation import route_stats, statement_totals
+from backend.pool import pool_stats
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# families: name -> {"type", "help", "samples": {key: [sample_name, labels, value]}}
+Families = Dict[str, dict]
+
+
+def _add(families: Families, name: str, kind: str, help_text: str, value: float, sample: Optional[str] = None, **labels):
+    family = families.setdefault(name, {"type": kind, "help": help_text, "samples": {}})
+    sample_name = sample or name
+    key = json.dumps([sample_name, labels], sort_keys=True)
+    family["samples"][key] = [sample_name, labels, value]
+
+
+def _add_histogram(families: Families, name: str, help_text: str, buckets_ms: Sequence[Optional[float]], counts: Sequence[int], sum_ms: float, **labels):
+    # Internal histograms are in milliseconds; Prometheus convention is seconds and cumulative buckets
+    cumulative = 0
+    for bound, count in zip(buckets_ms, counts):
+        cumulative += count
+        le = "+Inf" if bound is None else repr(bound / 1000)
+        _add(families, name, "histogram", help_text, cumulative, sample=f"{name}_bucket", le=le, **labels)
+    _add(families, name, "histogram", help_text, sum_ms / 1000, sample=f"{name}_sum", **labels)
+    _add(families, name, "histogram", help_text, cumulative, sample=f"{name}_count", **labels)
+
+
+def engine_pool_stats() -> List[dict]:
+    """Pool stats of every engine this process uses: primary, replicas and the async engine."""
+    engines = [("primary", database.engine)]
+    engines += [(f"replica{i}", replica) for i, replica in enumerate(database.replica_engines)]
+    engines.append(("async", database.async_engine))
+    return [stats for stats in (pool_stats(name, engine) for name, engine in engines) if stats is not None]
+
+
+def collect() -> Families:
+    """Snapshot of this process's metrics."""
+    families: Families = {}
+
+    for route in route_stats():
+        labels = {"method": route["method"], "route": route["route"]}
+        for status, count in route["statuses"].items():
+            _add(families, "http_requests_total", "counter", "HTTP requests by route and status.", count, status=status, **labels)
+        _add_histogram(
+            families, "http_request_duration_seconds", "HTTP request latency by route.",
+            [bucket["le_ms"] for bucket in route["latency_histogram"]],
+            [bucket["count"] for bucket in route["latency_histogram"]],
+            route["latency_ms_total"], **labels,
+        )
+        _add(families, "http_request_sql_statements_total", "counter", "SQL statements run by requests, by route.", route["queries_total"], **labels)
+        _add(families, "http_request_db_seconds_total", "counter", "Time requests spent in SQL statements, by route.", route["db_ms_total"] / 1000, **labels)
+        _add(families, "http_requests_over_budget_total", "counter", "Requests over the query-count or latency budget.", route["over_budget"], **labels)
+
+    _add(families, "sql_statements_total", "counter", "SQL statements executed, including background work.", statement_totals.count)
+    _add(families, "sql_statement_seconds_total", "counter", "Time spent executing SQL statements.", statement_totals.db_ms / 1000)
+
+    for pool in engine_pool_stats():
+        labels = {"pool": pool["name"]}
+        _add(families, "db_pool_size", "gauge", "Connections kept open by the pool.", pool["size"], **labels)
+        _add(families, "db_pool_max_overflow", "gauge", "Extra connections the pool may open under load.", pool["max_overflow"], **labels)
+        _add(families, "db_pool_checked_out", "gauge", "Connections currently in use.", pool["checked_out"], **labels)
+        _add(families, "db_pool_overflow", "gauge", "Open connections beyond the pool size.", pool["overflow"], **labels)
+        _add(families, "db_pool_checkout_timeouts_total", "counter", "Checkouts that gave up waiting for a connection.", pool["timeouts"], **labels)
+        _add_histogram(
+            families, "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.",
+            [bucket["le_ms"] for bucket in pool["wait_histogram"]],
+            [bucket["count"] for bucket in pool["wait_histogram"]],
+            pool["wait_ms_total"], **labels,
+        )
+
+    for name, histogram in (("password_hash_seconds", password_hash_ms), ("password_verify_seconds", password_verify_ms)):
+        snapshot = histogram.snapshot()
+        _add_histogram(
+            families, name, "Time spent in bcrypt, excluding the wait for a password worker.",
+            list(histogram.buckets) + [None], snapshot["counts"], snapshot["sum"],
+        )
+
+    for cache in cache_stats():
+        labels = {"cache": cache["name"]}
+        _add(families, "cache_hits_total", "counter", "In-process cache hits.", cache["hits"], **labels)
+        _add(families, "cache_misses_total", "counter", "In-process cache misses.", cache["misses"], **labels)
+        _add(families, "cache_entries", "gauge", "Entries currently held by the cache.", cache["size"], **labels)
+
+    return families
+
+
+def merge(snapshots: List[Families]) -> Families:
+    """Sums samples with the same name and labels across worker snapshots."""
+    merged: Families = {}
+    for families in snapshots:
+        for name, family in families.items():
+            target = merged.setdefault(name, {"type": family["type"], "help": family["help"], "samples": {}})
+            for key, (sample_name, labels, value) in family["samples"].items():
+                if key in target["samples"]:
+                    target["samples"][key][2] += value
+                else:
+                    target["samples"][key] = [sample_name, labels, value]
+    return merged
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def render(families: Families) -> str:
+    """Prometheus text exposition format."""
+    lines = []
+    for name in sorted(families):
+        family = families[name]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for sample_name, labels, value in family["samples"].values():
+            label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+            lines.append(f"{sample_name}{{{label_text}}} {value!r}" if label_text else f"{sample_name} {value!r}")
+    return "\n".join(lines) + "\n"
+
+
+class WorkerSnapshots:
+    """
+    Cross-worker aggregation for multi-process uvicorn. Every worker writes its
+    snapshot to `<directory>/<pid>.json` every `interval` seconds (and right before
+    serving /metrics); the serving worker sums all snapshots that are not stale.
+    Snapshots of workers that stopped updating are removed, so after a worker
+    restarts its counters start over, which Prometheus treats as a counter reset.
+    """
+
+    def __init__(self, directory: str, interval: float):
+        self.directory = directory
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f"{os.getpid()}.json")
+
+    def write(self):
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as snapshot_file:
+            json.dump(collect(), snapshot_file)
+        # Atomic, so readers never see a partial snapshot
+        os.replace(temporary, self.path)
+
+    def read_all(self) -> List[Families]:
+        snapshots = []
+        stale_before = time.time() - 3 * self.interval
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            try:
+                if os.path.getmtime(path) < stale_before:
+                    os.remove(path)
+                    continue
+                with open(path) as snapshot_file:
+                    snapshots.append(json.load(snapshot_file))
+            except (OSError, ValueError):
+                # Removed or replaced by its worker in the meantime
+                continue
+        return snapshots
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                print(f"--- Failed to write metrics snapshot: {e} ---")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self.write()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+# METRICS_DIR enables cross-worker aggregation; it must be shared by the workers and
+# emptied before the server starts (e.g. a tmpfs path cleared in the supervisord command)
+METRICS_DIR = os.getenv("METRICS_DIR")
+worker_snapshots = (
+    WorkerSnapshots(METRICS_DIR, interval=float(os.getenv("METRICS_SNAPSHOT_INTERVAL_SECONDS", "5")))
+    if METRICS_DIR else None
+)
+
+
+def metrics_text() -> str:
+    if worker_snapshots is None:
+        return render(collect())
+    worker_snapshots.write()
+    return render(merge(worker_snapshots.read_all()))
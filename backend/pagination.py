@@ -0,0 +1,70 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+from backend.database import Prompt
+
+# Header carrying the cursor for the next page. The body stays a plain list so
+# existing clients keep working; cursor mode is opted into with `?cursor=`
+# (an empty value means "start from the newest prompt").
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(prompt: Prompt) -> str:
+    """Encodes the (created_at, id) sort key of a prompt as an opaque cursor."""
+    raw = json.dumps([prompt.created_at.isoformat(), prompt.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """Decodes a cursor back into its sort key. An empty cursor means the first page."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, prompt_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(prompt_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+# Newest first, with id as the tie-breaker so the order is total
+CURSOR_ORDER = (Prompt.created_at.desc(), Prompt.id.desc())
+
+
+def cursor_criteria(cursor: str) -> list:
+    """Returns the WHERE criteria selecting the rows after `cursor` (none for the first page)."""
+    key = decode_cursor(cursor)
+    if key is None:
+        return []
+    created_at, prompt_id = key
+    return [
+        or_(
+            Prompt.created_at < created_at,
+            and_(Prompt.created_at == created_at, Prompt.id < prompt_id),
+        )
+    ]
+
+
+def split_page(rows: List[Prompt], limit: int) -> Tuple[List[Prompt], Optional[str]]:
+    """Trims rows fetched with `limit + 1` to one page and returns the next page's cursor, if any."""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1]) if has_more and rows else None
+    return rows, next_cursor
+
+
+def paginate_by_cursor(query: Query, cursor: str, limit: int) -> Tuple[List[Prompt], Optional[str]]:
+    """
+    Returns one page of prompts (newest first) after the given cursor, plus the
+    cursor for the following page or None when there are no more rows.
+    Seeks on (created_at, id) so deep pages cost the same as the first one.
+    """
+    # Fetch one extra row to find out whether another page exists
+    rows = query.filter(*cursor_criteria(cursor)).order_by(*CURSOR_ORDER).limit(limit + 1).all()
+    return split_page(rows, limit)
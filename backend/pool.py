@@ -0,0 +1,115 @@
+import os
+import time
+from typing import Optional
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from backend.histogram import Histogram
+
+# Upper bounds (ms) of the checkout wait histogram buckets; the last bucket is open-ended
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Starlette runs sync endpoints on a 40-thread pool. A request that holds a connection
+# while it waits for one of those threads (to run the endpoint after a dependency, or to
+# validate a returned model) deadlocks under load: every thread waits for a connection,
+# and every connection waits for a thread. No pool size prevents that, since the number
+# of waiting requests is unbounded. Instead, connections are only held while a thread is
+# running the request's code: sessions are closed when the endpoint returns (function-scoped
+# get_db/get_read_db), user lookups use their own short session, and endpoints that read
+# return an already serialized Response. Then at most 40 connections are in use, which
+# the defaults (size + overflow = 40) cover without waiting.
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_OVERFLOW = 30
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def pool_options(async_engine: bool = False) -> dict:
+    """
+    Engine keyword arguments for the connection pool, read from the environment:
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT (seconds to wait for a connection),
+    DB_POOL_RECYCLE (seconds before a connection is replaced, -1 to disable) and
+    DB_POOL_PRE_PING (test connections on checkout). Each uvicorn worker gets its own
+    pool, so the database sees up to workers * (size + overflow) connections.
+    """
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if async_engine else InstrumentedQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", str(DEFAULT_POOL_SIZE))),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", str(DEFAULT_MAX_OVERFLOW))),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": _env_flag("DB_POOL_PRE_PING", True),
+    }
+
+
+class WaitHistogram(Histogram):
+    """Histogram of checkout wait times in ms, plus a count of checkouts that timed out."""
+
+    def __init__(self):
+        super().__init__(WAIT_BUCKETS_MS)
+        self.timeouts = 0
+
+    def observe(self, wait_ms: float, timed_out: bool = False):
+        super().observe(wait_ms)
+        if timed_out:
+            with self._lock:
+                self.timeouts += 1
+
+    def report(self) -> dict:
+        snapshot = self.snapshot()
+        buckets = [{"le_ms": bound, "count": count} for bound, count in zip(self.buckets, snapshot["counts"])]
+        buckets.append({"le_ms": None, "count": snapshot["counts"][-1]})
+        return {"checkouts": snapshot["count"], "wait_ms_total": snapshot["sum"], "timeouts": self.timeouts, "wait_histogram": buckets}
+
+
+class _TimedCheckout:
+    # Times QueuePool._do_get, the step where a checkout blocks when every connection is in use
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waits = WaitHistogram()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.waits.observe((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        self.waits.observe((time.perf_counter() - start) * 1000)
+        return connection
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited for a connection."""
+
+
+def pool_stats(name: str, engine: Optional[Engine]) -> Optional[dict]:
+    """Current occupancy and checkout waits of an engine's pool, or None for other pool types."""
+    if engine is None:
+        return None
+    pool = engine.pool
+    if not isinstance(pool, _TimedCheckout):
+        return None
+    return {
+        "name": name,
+        "worker_pid": os.getpid(),
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        # QueuePool counts overflow from -size; only connections beyond `size` are overflow
+        "overflow": max(pool.overflow(), 0),
+        "timeout_seconds": pool.timeout(),
+        **pool.waits.report(),
+    }
@@ -0,0 +1,73 @@
+from typing import Dict, List, Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy.orm import joinedload, load_only
+
+from backend import schemas
+from backend.counters import view_buffer
+from backend.database import Prompt, User
+
+# Shared by the sync handlers in main.py and the async ones in async_routes.py
+
+# Temporary map to resolve subject_id to name, mirroring lib/subjects.ts
+subjects_map = {
+    "1": "산업공학입문",
+    "2": "경제성공학",
+    "3": "확률통계",
+}
+
+
+# Loader options for listings: only the columns schemas.PromptSummary needs, so the full
+# content is never read from disk or sent over the wire. Touching an unloaded column raises
+# instead of silently lazy-loading it row by row.
+SUMMARY_LOAD_OPTIONS = (
+    load_only(
+        Prompt.id, Prompt.title, Prompt.subject, Prompt.excerpt, Prompt.owner_id, Prompt.created_at,
+        Prompt.views, Prompt.likes, Prompt.dislikes, raiseload=True,
+    ),
+    joinedload(Prompt.owner).load_only(User.name, raiseload=True),
+)
+
+
+# Fields of the two representations, in schema order
+SUMMARY_FIELDS = list(schemas.PromptSummary.model_fields)
+FULL_FIELDS = list(schemas.Prompt.model_fields)
+
+
+def prompt_version(db_prompt: Prompt, feedback_type: Optional[str], exact_views: bool):
+    # Prompts are never edited after creation, so the counters plus the user's feedback identify the representation
+    views = db_prompt.views + (view_buffer.pending(db_prompt.id) if exact_views else 0)
+    return (db_prompt.id, views, db_prompt.likes, db_prompt.dislikes, feedback_type)
+
+
+def build_response_prompts(
+    prompts: List[Prompt], feedback_by_prompt: Dict[int, str], exact_views: bool = False,
+    schema: Type[BaseModel] = schemas.Prompt,
+) -> List[BaseModel]:
+    """Builds response prompts (schemas.Prompt or schemas.PromptSummary) with the current user's feedback attached."""
+    response_prompts = []
+    for db_prompt in prompts:
+        response_prompt = schema.from_orm(db_prompt)
+        response_prompt.current_user_feedback = feedback_by_prompt.get(db_prompt.id)
+        if exact_views:
+            # Include views that are still buffered in memory
+            response_prompt.views += view_buffer.pending(db_prompt.id)
+        response_prompts.append(response_prompt)
+    return response_prompts
+
+
+def prompt_rows(prompts: List[Prompt], fields: List[str], feedback_by_prompt: Dict[int, str], exact_views: bool = False) -> List[dict]:
+    """Plain response rows holding `fields`, in that order, with the current user's feedback attached."""
+    rows = []
+    for db_prompt in prompts:
+        row = {}
+        for name in fields:
+            if name == "current_user_feedback":
+                row[name] = feedback_by_prompt.get(db_prompt.id)
+            elif name == "views" and exact_views:
+                # Include views that are still buffered in memory
+                row[name] = db_prompt.views + view_buffer.pending(db_prompt.id)
+            else:
+                row[name] = getattr(db_prompt, name)
+        rows.append(row)
+    return rows
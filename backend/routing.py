@@ -0,0 +1,68 @@
+import itertools
+import math
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import Cookie, Depends, Response
+from jose import JWTError, jwt
+
+from backend.auth import ALGORITHM, SECRET_KEY, oauth2_scheme, token_subject
+from backend.database import ReplicaSessions, SessionLocal
+
+# After a user writes, their reads stay on the primary for READ_YOUR_WRITES_SECONDS so they
+# see their own writes while replicas catch up; the window should exceed the replicas' usual
+# lag. The marker travels with the client as a signed cookie, so every worker process honours
+# it. It is signed with its own key so it can never pass as an access token.
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+READ_YOUR_WRITES_COOKIE = "last_write"
+_READ_YOUR_WRITES_KEY = SECRET_KEY + ":read-your-writes"
+
+_next_replica = itertools.count()
+_next_replica_lock = threading.Lock()
+
+
+def mark_write(response: Response, username: str):
+    """Sets the cookie that pins `username`'s reads to the primary for a short window."""
+    expire = datetime.utcnow() + timedelta(seconds=READ_YOUR_WRITES_SECONDS)
+    marker = jwt.encode({"sub": username, "exp": expire}, _READ_YOUR_WRITES_KEY, algorithm=ALGORITHM)
+    response.set_cookie(
+        READ_YOUR_WRITES_COOKIE, marker,
+        max_age=math.ceil(READ_YOUR_WRITES_SECONDS), httponly=True, samesite="lax",
+    )
+
+
+def wrote_recently(username: Optional[str], marker: Optional[str]) -> bool:
+    """True when `marker` is an unexpired write marker issued to `username`."""
+    if username is None or marker is None:
+        return False
+    try:
+        payload = jwt.decode(marker, _READ_YOUR_WRITES_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return False
+    return payload.get("sub") == username
+
+
+def read_session_factory(username: Optional[str], marker: Optional[str] = None):
+    if not ReplicaSessions or wrote_recently(username, marker):
+        return SessionLocal
+    # Round-robin across the replicas
+    with _next_replica_lock:
+        index = next(_next_replica) % len(ReplicaSessions)
+    return ReplicaSessions[index]
+
+
+def get_read_db(
+    token: Optional[str] = Depends(oauth2_scheme),
+    last_write: Optional[str] = Cookie(None, alias=READ_YOUR_WRITES_COOKIE, include_in_schema=False),
+):
+    """
+    Session for read-only endpoints: a replica when any are configured, or the
+    primary for a user inside their read-your-writes window. Never write through it.
+    """
+    db = read_session_factory(token_subject(token), last_write)()
+    try:
+        yield db
+    finally:
+        db.close()
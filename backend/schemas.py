@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from pydantic import field_validator # Import field_validator for UserResponse
 
@@ -25,6 +25,96 @@ class Prompt(PromptBase):
     class Config:
         from_attributes = True
 
+# Listing entry: metadata, counters and a short excerpt instead of the full content
+class PromptSummary(BaseModel):
+    id: int
+    title: str
+    subject: str
+    excerpt: Optional[str] = None
+    owner_id: int
+    created_at: datetime
+    author: str
+    views: int
+    likes: int
+    dislikes: int
+    current_user_feedback: Optional[str] = None # 'like', 'dislike', or None
+
+    class Config:
+        from_attributes = True
+
+# GET /prompts/batch: the prompts found, in request order, and the requested ids that do not exist
+class PromptBatch(BaseModel):
+    prompts: List[Prompt]
+    missing: List[int]
+
+# Full-text search hit: prompt metadata plus a highlighted snippet instead of the full content
+class PromptSearchResult(BaseModel):
+    id: int
+    title: str
+    subject: str
+    created_at: datetime
+    owner_id: int
+    author: Optional[str] = None
+    views: int
+    likes: int
+    dislikes: int
+    snippet: Optional[str] = None
+    rank: float
+
+# Counters returned by endpoints that only change views/likes/dislikes
+class PromptCounters(BaseModel):
+    id: int
+    views: int
+    likes: int
+    dislikes: int
+
+# Site-wide statistics shown on the home page
+class StatsSummary(BaseModel):
+    prompt_count: int
+    total_likes: int
+
+# Hit/miss counters of an in-process cache
+class CacheStats(BaseModel):
+    name: str
+    hits: int
+    misses: int
+    hit_ratio: float
+    size: int
+
+class LatencyBucket(BaseModel):
+    le_ms: Optional[float] = None  # None is the open-ended last bucket
+    count: int
+
+class RouteStats(BaseModel):
+    method: str
+    route: str
+    requests: int
+    statuses: Dict[str, int]
+    latency_ms_total: float
+    latency_histogram: List[LatencyBucket]
+    queries_total: int
+    queries_per_request: float
+    db_ms_total: float
+    over_budget: int
+
+class PoolWaitBucket(BaseModel):
+    le_ms: Optional[float] = None  # None is the open-ended last bucket
+    count: int
+
+class PoolStats(BaseModel):
+    name: str
+    worker_pid: int
+    size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    timeout_seconds: float
+    checkouts: int
+    wait_ms_total: float
+    timeouts: int
+    wait_histogram: List[PoolWaitBucket]
+
 class UserBase(BaseModel):
     username: str
     email: EmailStr
@@ -97,7 +187,7 @@ class School(SchoolBase):
 # Pydantic schema for Subject
 class SubjectBase(BaseModel):
     name: str
-    school_id: int # Add school_id to SubjectBase
+    school_id: Optional[int] = None # Subject rows do not store a school yet
 
 class SubjectCreate(SubjectBase): # New schema for creation
     pass
@@ -0,0 +1,179 @@
+import html
+from typing import List, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from backend.database import Prompt, User
+
+# Snippets are safe to render as HTML: the prompt's own text is escaped and matched
+# terms are wrapped in HIGHLIGHT_START/HIGHLIGHT_END. The database marks matches with
+# private-use sentinels, which are only swapped for the tags after escaping.
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+_SENTINEL_START = "\ue000"
+_SENTINEL_END = "\ue001"
+SNIPPET_TOKENS = 16
+# Most results one search request may ask for
+SEARCH_MAX_LIMIT = 100
+
+# --- SQLite: FTS5 external-content table kept in sync by triggers ---
+# Only title/content changes touch the index, so counter updates stay cheap.
+_SQLITE_SETUP = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS prompts_fts USING fts5(
+        title, content, content='prompts', content_rowid='id', tokenize='unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS prompts_fts_ai AFTER INSERT ON prompts BEGIN
+        INSERT INTO prompts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS prompts_fts_ad AFTER DELETE ON prompts BEGIN
+        INSERT INTO prompts_fts(prompts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS prompts_fts_au AFTER UPDATE OF title, content ON prompts BEGIN
+        INSERT INTO prompts_fts(prompts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO prompts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+]
+
+# Ranking happens in the inner query; snippet() only runs for the returned page
+_SQLITE_SEARCH = """
+    WITH ranked AS (
+        SELECT prompts_fts.rowid AS id, bm25(prompts_fts, 10.0, 1.0) AS score
+        FROM prompts_fts {subject_join}
+        WHERE prompts_fts MATCH :query {subject_filter}
+        ORDER BY score
+        LIMIT :limit
+    )
+    SELECT p.id, p.title, p.subject, p.created_at, p.owner_id, p.views, p.likes, p.dislikes,
+           u.name AS author,
+           snippet(prompts_fts, 1, :hl_start, :hl_end, '…', :snippet_tokens) AS snippet,
+           -ranked.score AS rank
+    FROM ranked
+    JOIN prompts_fts ON prompts_fts.rowid = ranked.id
+    JOIN prompts p ON p.id = ranked.id
+    LEFT JOIN users u ON u.id = p.owner_id
+    WHERE prompts_fts MATCH :query
+    ORDER BY ranked.score
+"""
+
+# --- PostgreSQL: stored tsvector column with a GIN index, maintained by PostgreSQL itself ---
+# A generated column keeps the vector in sync on insert/update and lets ts_rank read it
+# instead of re-parsing every matching document. Title terms are weighted above content.
+# The 'simple' configuration is used because PostgreSQL ships no Korean stemmer.
+_PG_SETUP = [
+    """ALTER TABLE prompts ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_prompts_search_vector ON prompts USING GIN (search_vector)",
+]
+
+# Ranking happens in the inner query; ts_headline only runs for the returned page
+_PG_SEARCH = """
+    SELECT ranked.*, u.name AS author,
+           ts_headline('simple', p.content, to_tsquery('simple', :query),
+                       'StartSel=' || :hl_start || ', StopSel=' || :hl_end || ', MaxWords=' || :snippet_tokens || ', MinWords=5') AS snippet
+    FROM (
+        SELECT id, title, subject, created_at, owner_id, views, likes, dislikes,
+               ts_rank(search_vector, to_tsquery('simple', :query)) AS rank
+        FROM prompts
+        WHERE search_vector @@ to_tsquery('simple', :query) {subject_filter}
+        ORDER BY rank DESC
+        LIMIT :limit
+    ) ranked
+    JOIN prompts p ON p.id = ranked.id
+    LEFT JOIN users u ON u.id = ranked.owner_id
+    ORDER BY ranked.rank DESC
+"""
+
+
+def setup_search(engine: Engine):
+    """Creates the full-text index for the current dialect (idempotent)."""
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        is_new = not inspect(engine).has_table("prompts_fts")
+        with engine.begin() as conn:
+            for statement in _SQLITE_SETUP:
+                conn.exec_driver_sql(statement)
+            # Index the prompts that existed before the FTS table was created
+            if is_new:
+                conn.exec_driver_sql("INSERT INTO prompts_fts(prompts_fts) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        with engine.begin() as conn:
+            for statement in _PG_SETUP:
+                conn.exec_driver_sql(statement)
+
+
+def _fts5_query(q: str) -> str:
+    # Quote every term so user input cannot inject FTS5 syntax, and match it as a
+    # prefix so Korean words still match when followed by a particle (프롬프트 -> 프롬프트를)
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in q.split())
+
+
+def _tsquery(q: str) -> str:
+    return " & ".join("'" + term.replace("\\", "\\\\").replace("'", "''") + "':*" for term in q.split())
+
+
+def search_prompts(db: Session, q: str, limit: int = 20, subject: Optional[str] = None) -> List[dict]:
+    """
+    Returns prompts matching every term of `q`, best match first, each with a
+    highlighted snippet of its content. Full content is never loaded into Python.
+    """
+    if not q.split():
+        return []
+
+    dialect = db.get_bind().dialect.name
+    params = {
+        "limit": limit,
+        "hl_start": _SENTINEL_START,
+        "hl_end": _SENTINEL_END,
+        "snippet_tokens": SNIPPET_TOKENS,
+    }
+    if subject:
+        params["subject"] = subject
+
+    if dialect == "sqlite":
+        sql = _SQLITE_SEARCH.format(
+            subject_join="JOIN prompts p ON p.id = prompts_fts.rowid" if subject else "",
+            subject_filter="AND p.subject = :subject" if subject else "",
+        )
+        params["query"] = _fts5_query(q)
+    elif dialect == "postgresql":
+        sql = _PG_SEARCH.format(subject_filter="AND subject = :subject" if subject else "")
+        params["query"] = _tsquery(q)
+    else:
+        return search_prompts_ilike(db, q, limit, subject)
+
+    results = []
+    for row in db.execute(text(sql), params).mappings():
+        result = dict(row)
+        result["snippet"] = render_snippet(result["snippet"])
+        results.append(result)
+    return results
+
+
+def render_snippet(snippet: Optional[str]) -> Optional[str]:
+    """Escapes a snippet as HTML, then turns the sentinel markers into <mark> tags."""
+    if snippet is None:
+        return None
+    escaped = html.escape(snippet, quote=False)
+    return escaped.replace(_SENTINEL_START, HIGHLIGHT_START).replace(_SENTINEL_END, HIGHLIGHT_END)
+
+
+def search_prompts_ilike(db: Session, q: str, limit: int, subject: Optional[str]) -> List[dict]:
+    """Unindexed fallback for dialects without a full-text index: every term must appear somewhere."""
+    query = db.query(Prompt, User.name).outerjoin(User, User.id == Prompt.owner_id)
+    for term in q.split():
+        query = query.filter(Prompt.title.ilike(f"%{term}%") | Prompt.content.ilike(f"%{term}%"))
+    if subject:
+        query = query.filter(Prompt.subject == subject)
+
+    results = []
+    for prompt, author in query.order_by(Prompt.created_at.desc()).limit(limit):
+        results.append({
+            "id": prompt.id, "title": prompt.title, "subject": prompt.subject, "created_at": prompt.created_at,
+            "owner_id": prompt.owner_id, "views": prompt.views, "likes": prompt.likes, "dislikes": prompt.dislikes,
+            "author": author, "snippet": render_snippet((prompt.content or "")[:200]), "rank": 0.0,
+        })
+    return results
@@ -0,0 +1,49 @@
+from functools import lru_cache
+from typing import Any, List, Type
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson. Bytes are sent as they are, for bodies pydantic already serialized."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(content)
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    # Building a TypeAdapter compiles its validator and serializer, so do it once per schema
+    return TypeAdapter(List[schema])
+
+
+def json_response(response: Response, content: Any) -> FastJSONResponse:
+    """
+    Returns `content` (JSON-able data or pre-encoded bytes) as the endpoint's response,
+    bypassing its response_model. Headers already set on `response` (ETag, Vary,
+    cursor) are kept.
+    """
+    return FastJSONResponse(content, headers=dict(response.headers))
+
+
+def validated_list_response(response: Response, schema: Type[BaseModel], rows: List[dict]) -> FastJSONResponse:
+    """
+    Validates plain row dicts against List[schema] in a single pass and writes the
+    result straight to JSON bytes. This replaces building a model per row with
+    from_orm and then having FastAPI validate the list against response_model again.
+    """
+    adapter = list_adapter(schema)
+    return json_response(response, adapter.dump_json(adapter.validate_python(rows)))
+
+
+def validated_response(response: Response, schema: Type[BaseModel], content: Any) -> FastJSONResponse:
+    """
+    validated_list_response for a single object: `content` (a dict, or an ORM object for
+    schemas with from_attributes) is validated against `schema` once and written to bytes.
+    """
+    return json_response(response, schema.model_validate(content).model_dump_json().encode())
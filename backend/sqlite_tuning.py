@@ -0,0 +1,150 @@
+import contextvars
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+
+def sqlite_pragmas() -> List[Tuple[str, str]]:
+    """
+    Per-connection pragmas for a single-box SQLite deployment, read from the environment:
+    SQLITE_JOURNAL_MODE (WAL lets readers run alongside the writer), SQLITE_SYNCHRONOUS
+    (NORMAL only fsyncs at checkpoints in WAL mode), SQLITE_MMAP_SIZE (bytes),
+    SQLITE_CACHE_SIZE (negative values are KiB) and SQLITE_BUSY_TIMEOUT_MS (how long a
+    writer waits for the lock before failing with 'database is locked').
+    """
+    journal_mode = os.getenv("SQLITE_JOURNAL_MODE", "WAL").upper()
+    synchronous = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+    if not journal_mode.isalpha() or not synchronous.isalpha():
+        raise ValueError("SQLITE_JOURNAL_MODE and SQLITE_SYNCHRONOUS must be pragma keywords")
+    return [
+        ("journal_mode", journal_mode),
+        ("synchronous", synchronous),
+        ("mmap_size", str(int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))))),
+        ("cache_size", str(int(os.getenv("SQLITE_CACHE_SIZE", "-65536")))),
+        ("busy_timeout", str(int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")))),
+    ]
+
+
+def configure_sqlite(engine: Engine):
+    """Applies sqlite_pragmas() to every new connection of `engine` (sync, or an async engine's sync_engine)."""
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+class SingleWriter:
+    """
+    Runs write transactions on one dedicated thread, so SQLite writers queue in
+    process instead of contending for the database lock. Jobs that queue up while a
+    batch is being written are committed together in the next transaction: each job
+    runs inside its own SAVEPOINT, so a failing job is rolled back alone, and the
+    batch shares a single COMMIT.
+    """
+
+    def __init__(self, database_url: str, max_batch: int):
+        self.database_url = database_url
+        self.max_batch = max_batch
+        self.batches = 0
+        self.jobs = 0
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread = None
+        self._session_factory = None
+
+    def _create_engine(self) -> Engine:
+        engine = create_engine(
+            self.database_url, connect_args={"check_same_thread": False}, pool_size=1, max_overflow=0
+        )
+        configure_sqlite(engine)
+
+        # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN.
+        # IMMEDIATE takes the write lock up front instead of failing on upgrade.
+        @event.listens_for(engine, "connect")
+        def disable_pysqlite_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine, "begin")
+        def begin_immediate(connection):
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+        return engine
+
+    def submit(self, fn: Callable[[Session], Any]) -> Any:
+        """
+        Runs fn(session) on the writer thread and blocks until its batch is committed.
+        Returns fn's result, or raises what fn (or the COMMIT) raised. The session does
+        not expire on commit, so returned ORM objects stay readable once detached.
+        """
+        if self._thread is None:
+            raise RuntimeError("The single writer is not running")
+        future: Future = Future()
+        # Run the job in the caller's context so per-request instrumentation counts its statements
+        self._queue.put((fn, future, contextvars.copy_context()))
+        return future.result()
+
+    def _run(self):
+        running = True
+        while running:
+            job = self._queue.get()
+            if job is None:
+                break
+            batch = [job]
+            # Group commit: take whatever queued up meanwhile, without waiting for more
+            while len(batch) < self.max_batch:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    running = False
+                    break
+                batch.append(job)
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[tuple]):
+        outcomes = []
+        with self._session_factory() as session:
+            for fn, future, context in batch:
+                try:
+                    with session.begin_nested():
+                        outcomes.append((future, context.run(fn, session), None))
+                except Exception as error:
+                    outcomes.append((future, None, error))
+            try:
+                session.commit()
+            except Exception as error:
+                session.rollback()
+                outcomes = [(future, None, job_error or error) for future, _, job_error in outcomes]
+        self.batches += 1
+        self.jobs += len(batch)
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._session_factory = sessionmaker(bind=self._create_engine(), autoflush=False, expire_on_commit=False)
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Writes the jobs already queued, then stops the thread."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self._session_factory.kw["bind"].dispose()
@@ -0,0 +1,90 @@
+import os
+import threading
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from backend.database import Prompt
+
+
+class SiteStats:
+    """
+    In-process site-wide counters (number of prompts, total likes) so the home
+    page does not run COUNT(*) and SUM(likes) over the prompts table on every load.
+    The counters are seeded with one aggregate query, adjusted by the
+    create-prompt and feedback paths, and re-synced from the database every
+    `resync_interval` seconds so changes made by other worker processes show up.
+    """
+
+    def __init__(self, resync_interval: float):
+        self.resync_interval = resync_interval
+        self._prompt_count = 0
+        self._total_likes = 0
+        self._synced_at = None
+        self._lock = threading.Lock()
+        # Only one caller resyncs at a time. Changes recorded while its query runs are
+        # kept aside and applied on top of the fresh totals.
+        self._resyncing = False
+        self._resynced = threading.Condition(self._lock)
+        self._prompts_during_resync = 0
+        self._likes_during_resync = 0
+
+    def summary(self, db: Session) -> dict:
+        with self._lock:
+            while self._is_stale():
+                if not self._resyncing:
+                    self._resyncing = True
+                    break
+                if self._synced_at is not None:
+                    # Another caller is resyncing; serve the current counters meanwhile
+                    return self._counters()
+                # Nothing to serve before the first sync completes
+                self._resynced.wait()
+            else:
+                return self._counters()
+
+        self.resync(db)
+        with self._lock:
+            return self._counters()
+
+    def resync(self, db: Session):
+        """Reloads both counters from the prompts table in a single query."""
+        with self._lock:
+            self._resyncing = True
+            self._prompts_during_resync = self._likes_during_resync = 0
+        try:
+            prompt_count, total_likes = db.execute(
+                select(func.count(Prompt.id), func.coalesce(func.sum(Prompt.likes), 0))
+            ).one()
+            with self._lock:
+                self._prompt_count = prompt_count + self._prompts_during_resync
+                self._total_likes = total_likes + self._likes_during_resync
+                self._synced_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._resyncing = False
+                self._resynced.notify_all()
+
+    def prompt_created(self):
+        with self._lock:
+            self._prompt_count += 1
+            if self._resyncing:
+                self._prompts_during_resync += 1
+
+    def likes_changed(self, delta: int):
+        with self._lock:
+            self._total_likes += delta
+            if self._resyncing:
+                self._likes_during_resync += delta
+
+    def _is_stale(self) -> bool:
+        # Caller holds the lock
+        return self._synced_at is None or time.monotonic() - self._synced_at >= self.resync_interval
+
+    def _counters(self) -> dict:
+        # Caller holds the lock
+        return {"prompt_count": self._prompt_count, "total_likes": self._total_likes}
+
+
+site_stats = SiteStats(resync_interval=float(os.getenv("STATS_RESYNC_INTERVAL_SECONDS", "60")))
@@ -0,0 +1,112 @@
+"""
+Shared fixtures: the app running against a throwaway SQLite database, an
+in-process httpx client, and factories that insert users and prompts directly.
+
+    python -m pytest -q backend/tests
+"""
+import asyncio
+import contextlib
+import itertools
+import os
+import tempfile
+
+# The engine is created when backend.database is imported, so point it at a fresh
+# database before any backend module is loaded
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="prompt-tests-"), "test.db")
+os.environ.pop("DATABASE_REPLICA_URLS", None)
+os.environ["DB_MODE"] = "sync"
+
+import httpx
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from backend import database as models
+from backend.auth import create_access_token
+
+_next_user = itertools.count()
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextlib.contextmanager
+def count_queries():
+    """Records the SQL statements any engine runs inside the block."""
+    counter = QueryCounter()
+
+    def count(conn, cursor, statement, *args):
+        counter.statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", count)
+    try:
+        yield counter
+    finally:
+        event.remove(Engine, "before_cursor_execute", count)
+
+
+@pytest.fixture(scope="session")
+def app():
+    from backend.main import app
+
+    asyncio.run(app.router.startup())
+    yield app
+    asyncio.run(app.router.shutdown())
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def client(app):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test", timeout=120) as client:
+        yield client
+
+
+@pytest.fixture
+def make_users(app):
+    """Inserts `count` users (skipping signup and bcrypt) and returns (user_id, auth headers) pairs."""
+    def make(count: int):
+        db = models.SessionLocal()
+        try:
+            users = []
+            for _ in range(count):
+                n = next(_next_user)
+                users.append(models.User(username=f"user{n}", email=f"user{n}@example.com", hashed_password="-", name=f"User {n}"))
+            db.add_all(users)
+            db.commit()
+            return [
+                (user.id, {"Authorization": "Bearer " + create_access_token({"sub": user.username})})
+                for user in users
+            ]
+        finally:
+            db.close()
+
+    return make
+
+
+@pytest.fixture
+def make_prompts(app):
+    """Inserts `count` prompts owned by `owner_id` and returns their ids."""
+    def make(owner_id: int, count: int = 1):
+        db = models.SessionLocal()
+        try:
+            prompts = [
+                models.Prompt(title=f"프롬프트 {i}", content="베이즈 정리를 단계별로 설명해줘.", subject="확률통계", owner_id=owner_id)
+                for i in range(count)
+            ]
+            db.add_all(prompts)
+            db.commit()
+            return [prompt.id for prompt in prompts]
+        finally:
+            db.close()
+
+    return make
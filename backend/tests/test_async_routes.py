@@ -0,0 +1,53 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend import database as models
+from backend.async_routes import use_async_routes
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def async_client(app, monkeypatch):
+    """A client for a copy of the app whose hot read endpoints run through use_async_routes."""
+    engine = create_async_engine(models.to_async_url(str(models.engine.url)))
+    monkeypatch.setattr(models, "async_engine", engine)
+    monkeypatch.setattr(models, "AsyncSessionLocal", async_sessionmaker(engine, autoflush=False, expire_on_commit=False))
+    async_app = FastAPI()
+    async_app.router.routes = list(app.router.routes)
+    use_async_routes(async_app)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=async_app), base_url="http://test") as client:
+        yield client
+    await engine.dispose()
+
+
+async def test_listing_and_detail_match_the_sync_routes(client, async_client, make_users, make_prompts):
+    (user_id, headers), = make_users(1)
+    prompt_id, _ = make_prompts(user_id, 2)
+    await client.post(f"/prompts/{prompt_id}/feedback", json={"feedback_type": "like"}, headers=headers)
+
+    for url in ("/prompts/?limit=5&cursor=", f"/prompts/{prompt_id}", f"/prompts/{prompt_id}?fields=id,likes,current_user_feedback"):
+        sync_response = await client.get(url, headers=headers)
+        async_response = await async_client.get(url, headers=headers)
+        assert async_response.status_code == 200
+        assert async_response.content == sync_response.content, url
+        assert async_response.headers["ETag"] == sync_response.headers["ETag"]
+
+        not_modified = await async_client.get(url, headers={**headers, "If-None-Match": async_response.headers["ETag"]})
+        assert not_modified.status_code == 304
+
+    assert (await async_client.get("/prompts/0")).status_code == 404
+
+
+async def test_increment_view_counts_a_user_once(async_client, make_users, make_prompts):
+    (user_id, headers), = make_users(1)
+    (prompt_id,) = make_prompts(user_id)
+
+    first = await async_client.post(f"/prompts/{prompt_id}/increment-view", headers=headers)
+    assert first.status_code == 200
+    assert first.json()["views"] == 1
+    again = await async_client.post(f"/prompts/{prompt_id}/increment-view", headers=headers)
+    assert again.json()["views"] == 1
+    assert (await async_client.post(f"/prompts/{prompt_id}/increment-view")).status_code == 401
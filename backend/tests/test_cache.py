@@ -0,0 +1,47 @@
+from backend import cache
+from backend.cache import TTLCache
+
+
+def load_while(cache_: TTLCache, key, during):
+    """Runs get_or_load for `key` with `during()` happening while the loader runs."""
+    def loader():
+        during()
+        return f"loaded {key}"
+
+    return cache_.get_or_load(key, loader)
+
+
+def test_invalidating_another_key_keeps_an_in_flight_load():
+    users = TTLCache("test-other-key", ttl=60)
+    load_while(users, "alice", lambda: users.invalidate("bob"))
+    assert users.get("alice") == "loaded alice"
+
+
+def test_invalidating_the_same_key_discards_an_in_flight_load():
+    users = TTLCache("test-same-key", ttl=60)
+    assert load_while(users, "alice", lambda: users.invalidate("alice")) == "loaded alice"
+    assert users.get("alice") is None
+    # The next load, started after the invalidation, is cached again
+    users.get_or_load("alice", lambda: "reloaded")
+    assert users.get("alice") == "reloaded"
+
+
+def test_clearing_the_cache_discards_every_in_flight_load():
+    users = TTLCache("test-clear", ttl=60)
+    load_while(users, "alice", lambda: users.invalidate())
+    assert users.get("alice") is None
+
+
+def test_forgotten_invalidations_still_discard_older_loads(monkeypatch):
+    monkeypatch.setattr(cache, "INVALIDATION_HISTORY", 2)
+    users = TTLCache("test-history", ttl=60)
+
+    def invalidate_many():
+        users.invalidate("alice")
+        for n in range(5):
+            users.invalidate(f"user{n}")
+
+    load_while(users, "alice", invalidate_many)
+    assert users.get("alice") is None
+    users.get_or_load("alice", lambda: "reloaded")
+    assert users.get("alice") == "reloaded"
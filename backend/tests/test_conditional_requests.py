@@ -0,0 +1,98 @@
+import pytest
+
+from backend import database as models
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("path", ["/prompts/?limit=5", "/subjects/", "/stats/summary"])
+async def test_not_modified_keeps_the_vary_header_of_the_full_response(client, make_users, make_prompts, path):
+    (user_id, _), = make_users(1)
+    make_prompts(user_id, 5)
+    headers = {"Accept-Encoding": "gzip"}
+
+    full = await client.get(path, headers=headers)
+    assert full.status_code == 200
+    not_modified = await client.get(path, headers={**headers, "If-None-Match": full.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == full.headers["ETag"]
+    vary = {token.strip().lower() for token in not_modified.headers["Vary"].split(",")}
+    assert vary == {token.strip().lower() for token in full.headers["Vary"].split(",")}
+    assert "accept-encoding" in vary
+
+
+async def etag(client, path, headers=None):
+    response = await client.get(path, headers=headers)
+    assert response.status_code == 200
+    return response.headers["ETag"]
+
+
+@pytest.mark.parametrize("path", ["/prompts/?limit=5&cursor=", "/prompts/{prompt_id}", "/schools/", "/subjects/"])
+async def test_matching_etag_gets_an_empty_304(client, make_users, make_prompts, path):
+    (user_id, headers), = make_users(1)
+    (prompt_id,) = make_prompts(user_id)
+    path = path.format(prompt_id=prompt_id)
+
+    full = await client.get(path, headers=headers)
+    not_modified = await client.get(path, headers={**headers, "If-None-Match": full.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == full.headers["ETag"]
+    assert not_modified.headers["Vary"] == full.headers["Vary"]
+
+    stale = await client.get(path, headers={**headers, "If-None-Match": 'W/"stale"'})
+    assert stale.status_code == 200
+    assert stale.content == full.content
+
+
+async def test_prompt_etags_change_with_feedback_and_new_prompts(client, make_users, make_prompts):
+    (user_id, headers), (_, other_headers) = make_users(2)
+    (prompt_id,) = make_prompts(user_id)
+    paths = ["/prompts/?limit=5&cursor=", f"/prompts/{prompt_id}"]
+
+    async def etags(headers):
+        return [await etag(client, path, headers) for path in paths]
+
+    before, anonymous_before = await etags(headers), await etags(None)
+    await client.post(f"/prompts/{prompt_id}/feedback", json={"feedback_type": "like"}, headers=headers)
+    after_like, anonymous_after_like = await etags(headers), await etags(None)
+    assert all(a != b for a, b in zip(before, after_like))
+    assert all(a != b for a, b in zip(anonymous_before, anonymous_after_like))
+
+    # Another user's dislike changes the counters everyone sees
+    await client.post(f"/prompts/{prompt_id}/feedback", json={"feedback_type": "dislike"}, headers=other_headers)
+    after_dislike = await etags(headers)
+    assert all(a != b for a, b in zip(after_like, after_dislike))
+
+    # Same counters, but the user's own feedback is part of their representation
+    assert await etags(headers) != await etags(other_headers)
+
+    make_prompts(user_id)
+    assert await etag(client, paths[0], headers) != after_dislike[0]
+    assert await etag(client, paths[1], headers) == after_dislike[1]
+
+
+async def test_exact_views_etag_tracks_buffered_views(client, make_users, make_prompts):
+    (user_id, headers), = make_users(1)
+    (prompt_id,) = make_prompts(user_id)
+    exact, approximate = f"/prompts/{prompt_id}?exact_views=true", f"/prompts/{prompt_id}"
+
+    exact_before = await etag(client, exact)
+    assert exact_before == await etag(client, approximate)
+    await client.post(f"/prompts/{prompt_id}/increment-view", headers=headers)
+    # The view is counted in the exact representation even while it is still buffered
+    assert await etag(client, exact) != exact_before
+
+
+async def test_reference_data_etags_change_when_rows_are_added(client):
+    from backend.main import create_school_if_not_exists, create_subject_if_not_exists
+
+    schools, subjects = await etag(client, "/schools/"), await etag(client, "/subjects/")
+    db = models.SessionLocal()
+    try:
+        create_school_if_not_exists(db, "테스트 학교")
+        create_subject_if_not_exists(db, "테스트 과목")
+    finally:
+        db.close()
+    assert await etag(client, "/schools/") != schools
+    assert await etag(client, "/subjects/") != subjects
@@ -0,0 +1,21 @@
+import asyncio
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+# Well above the 40 threads and 40 pooled connections, so a request that holds a
+# connection while it waits for a thread would stall the rest until the pool times out
+CONCURRENT_REQUESTS = 400
+
+
+async def test_concurrent_detail_reads_do_not_exhaust_the_pool(client, make_users, make_prompts):
+    # Fresh users, so every request also resolves its user from the database
+    users = make_users(CONCURRENT_REQUESTS)
+    (prompt_id,) = make_prompts(users[0][0])
+
+    responses = await asyncio.gather(*[
+        client.get(f"/prompts/{prompt_id}", headers=headers if i % 2 else {})
+        for i, (_, headers) in enumerate(users)
+    ])
+    assert [r.status_code for r in responses] == [200] * CONCURRENT_REQUESTS
@@ -0,0 +1,48 @@
+import asyncio
+import random
+
+import pytest
+from sqlalchemy import func
+
+from backend import database as models
+
+pytestmark = pytest.mark.anyio
+
+VOTERS = 100
+TOGGLES_PER_VOTER = 3
+# Requests in flight at once; kept under the engine's pool size (5 + 10 overflow)
+CONCURRENCY = 10
+
+
+async def test_parallel_toggles_keep_counters_consistent(client, make_users, make_prompts):
+    (owner_id, _), *voters = make_users(VOTERS + 1)
+    (prompt_id,) = make_prompts(owner_id)
+
+    rng = random.Random(4)
+    toggles = [
+        (headers, rng.choice(["like", "dislike"]))
+        for _, headers in voters for _ in range(TOGGLES_PER_VOTER)
+    ]
+    rng.shuffle(toggles)
+    in_flight = asyncio.Semaphore(CONCURRENCY)
+
+    async def toggle(headers, feedback_type):
+        async with in_flight:
+            return await client.post(f"/prompts/{prompt_id}/feedback", json={"feedback_type": feedback_type}, headers=headers)
+
+    responses = await asyncio.gather(*[toggle(headers, feedback_type) for headers, feedback_type in toggles])
+    assert [r.status_code for r in responses] == [200] * len(toggles)
+
+    db = models.SessionLocal()
+    try:
+        prompt = db.get(models.Prompt, prompt_id)
+        feedback = dict(
+            db.query(models.PromptFeedback.feedback_type, func.count())
+            .filter(models.PromptFeedback.prompt_id == prompt_id)
+            .group_by(models.PromptFeedback.feedback_type)
+            .all()
+        )
+    finally:
+        db.close()
+    assert (prompt.likes, prompt.dislikes) == (feedback.get("like", 0), feedback.get("dislike", 0))
+    assert prompt.likes + prompt.dislikes > 0
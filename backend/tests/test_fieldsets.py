@@ -0,0 +1,59 @@
+import pytest
+
+from backend.tests.conftest import count_queries
+
+pytestmark = pytest.mark.anyio
+
+
+def prompt_selects(statements):
+    return [s for s in statements if s.lstrip().startswith("SELECT") and "FROM prompts" in s]
+
+
+@pytest.mark.parametrize("path", ["/prompts/?limit=5&cursor=", "/prompts/{prompt_id}", "/prompts/batch?ids={prompt_id}", "/users/me/prompts"])
+async def test_unrequested_columns_are_not_selected(client, make_users, make_prompts, path):
+    (user_id, headers), = make_users(1)
+    (prompt_id,) = make_prompts(user_id)
+    path = path.format(prompt_id=prompt_id)
+    separator = "&" if "?" in path else "?"
+    await client.get(path, headers=headers)
+
+    with count_queries() as queries:
+        response = await client.get(f"{path}{separator}fields=id,title", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    rows = body["prompts"] if "prompts" in body else body if isinstance(body, list) else [body]
+    assert rows and all(set(row) == {"id", "title"} for row in rows)
+
+    (select,) = prompt_selects(queries.statements)
+    assert "prompts.title" in select
+    assert "prompts.content" not in select
+    assert "prompts.excerpt" not in select
+    assert "users" not in select
+
+
+async def test_author_joins_only_the_owner_name(client, make_users, make_prompts):
+    (user_id, headers), = make_users(1)
+    (prompt_id,) = make_prompts(user_id)
+
+    with count_queries() as queries:
+        response = await client.get(f"/prompts/{prompt_id}?fields=id,author", headers=headers)
+    assert response.json()["id"] == prompt_id
+    assert set(response.json()) == {"id", "author"} and response.json()["author"]
+
+    (select,) = prompt_selects(queries.statements)
+    assert "users_1.name" in select
+    assert "hashed_password" not in select and "users_1.email" not in select
+    assert "prompts.content" not in select
+
+
+@pytest.mark.parametrize("path", ["/prompts/", "/prompts/{prompt_id}", "/prompts/batch?ids={prompt_id}", "/users/me/prompts"])
+@pytest.mark.parametrize("fields", ["id,nope", "hashed_password", ","])
+async def test_unknown_fields_are_rejected(client, make_users, make_prompts, path, fields):
+    (user_id, headers), = make_users(1)
+    (prompt_id,) = make_prompts(user_id)
+    path = path.format(prompt_id=prompt_id)
+    separator = "&" if "?" in path else "?"
+
+    response = await client.get(f"{path}{separator}fields={fields}", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Unknown fields:")
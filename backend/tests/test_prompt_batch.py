@@ -0,0 +1,66 @@
+import pytest
+
+from backend import database as models
+from backend.main import PROMPT_BATCH_MAX_IDS
+from backend.tests.conftest import count_queries
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_batch_loads_every_prompt_in_one_query(client, make_users, make_prompts):
+    owners = make_users(PROMPT_BATCH_MAX_IDS)
+    prompt_ids = [prompt_id for owner_id, _ in owners for prompt_id in make_prompts(owner_id)]
+    (_, headers) = owners[0]
+    db = models.SessionLocal()
+    try:
+        db.add_all(models.PromptFeedback(user_id=owners[0][0], prompt_id=prompt_id, feedback_type="like") for prompt_id in prompt_ids[::2])
+        db.commit()
+    finally:
+        db.close()
+    ids = ",".join(map(str, prompt_ids))
+
+    with count_queries() as queries:
+        response = await client.get(f"/prompts/batch?ids={ids}")
+    assert response.status_code == 200
+    assert all(p["author"] for p in response.json()["prompts"])
+    # The prompts with their owners joined
+    assert queries.count == 1, queries.statements
+
+    await client.get(f"/prompts/batch?ids={prompt_ids[0]}", headers=headers)
+    with count_queries() as queries:
+        response = await client.get(f"/prompts/batch?ids={ids}", headers=headers)
+    feedback = [p["current_user_feedback"] for p in response.json()["prompts"]]
+    assert feedback == ["like" if i % 2 == 0 else None for i in range(len(prompt_ids))]
+    # ... plus one lookup of the user's feedback on all of them
+    assert queries.count == 2, queries.statements
+
+
+async def test_missing_ids_are_listed_in_request_order(client, make_users, make_prompts):
+    (user_id, _), = make_users(1)
+    first, second = make_prompts(user_id, 2)
+    absent = second + 1_000_000
+
+    response = await client.get(f"/prompts/batch?ids={second},{absent},{first},{second},{absent - 1}")
+    assert response.status_code == 200
+    body = response.json()
+    assert [p["id"] for p in body["prompts"]] == [second, first]
+    assert body["missing"] == [absent, absent - 1]
+
+    response = await client.get(f"/prompts/batch?ids={absent}")
+    assert response.json() == {"prompts": [], "missing": [absent]}
+
+
+@pytest.mark.parametrize("ids", [
+    ",".join(str(n) for n in range(1, PROMPT_BATCH_MAX_IDS + 2)),
+    "",
+    ",",
+    "1,two",
+])
+async def test_invalid_id_lists_are_rejected(client, ids):
+    response = await client.get("/prompts/batch", params={"ids": ids})
+    assert response.status_code == 400
+
+
+async def test_the_maximum_number_of_ids_is_accepted(client):
+    ids = ",".join(str(n) for n in range(1, PROMPT_BATCH_MAX_IDS + 1))
+    assert (await client.get("/prompts/batch", params={"ids": ids})).status_code == 200
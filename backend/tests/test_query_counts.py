@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import func
+
+from backend import database as models
+from backend.tests.conftest import count_queries
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_logged_in_listing_query_count_does_not_grow_with_page_size(client, make_users, make_prompts):
+    (user_id, headers), = make_users(1)
+    make_prompts(user_id, 50)
+    # A first request settles any per-user lookups, so only the page's own queries are compared
+    await client.get("/prompts/?limit=1", headers=headers)
+
+    counts = {}
+    for limit in (1, 10, 50):
+        with count_queries() as queries:
+            response = await client.get(f"/prompts/?limit={limit}", headers=headers)
+        assert response.status_code == 200
+        assert len(response.json()) == limit
+        counts[limit] = queries.count
+    assert len(set(counts.values())) == 1, counts
+
+
+async def test_full_page_with_feedback_runs_a_constant_number_of_queries(client, make_users, make_prompts):
+    (user_id, headers), *owners = make_users(101)
+    db = models.SessionLocal()
+    try:
+        # Page past the prompts other tests inserted
+        skip = db.query(func.count(models.Prompt.id)).scalar()
+        # One owner per prompt, so lazy-loading authors would cost a query per row
+        prompt_ids = [prompt_id for owner_id, _ in owners for prompt_id in make_prompts(owner_id)]
+        db.add_all(
+            models.PromptFeedback(user_id=user_id, prompt_id=prompt_id, feedback_type="like" if i % 2 else "dislike")
+            for i, prompt_id in enumerate(prompt_ids)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    with count_queries() as queries:
+        response = await client.get(f"/prompts/?skip={skip}&limit=100", headers=headers)
+    assert response.status_code == 200
+    page = response.json()
+    assert sorted(p["id"] for p in page) == prompt_ids
+    assert all(p["author"] and p["current_user_feedback"] in ("like", "dislike") for p in page)
+    # At most the user lookup, the page with its owners joined, and the user's feedback on it
+    assert queries.count <= 3, queries.count
@@ -0,0 +1,46 @@
+import os
+import tempfile
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend import database as models
+from backend import routing
+from backend.routing import READ_YOUR_WRITES_COOKIE
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def empty_replica(monkeypatch):
+    """Routes reads to a replica that never receives the primary's writes."""
+    engine = create_engine("sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="prompt-replica-"), "replica.db"))
+    models.Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(routing, "ReplicaSessions", [sessionmaker(bind=engine)])
+    yield
+    engine.dispose()
+
+
+async def test_write_then_read_from_another_worker_hits_the_primary(app, client, make_users, empty_replica):
+    (_, headers), (_, other_headers) = make_users(2)
+    created = await client.post(
+        "/prompts/", json={"title": "제목", "content": "내용", "subject": "확률통계"}, headers=headers,
+    )
+    assert created.status_code == 200
+    marker = created.cookies[READ_YOUR_WRITES_COOKIE]
+    prompt_id = created.json()["id"]
+
+    # A fresh client stands in for a worker that did not handle the write: the only
+    # state it has is what the client carries
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as fresh:
+        fresh.cookies.set(READ_YOUR_WRITES_COOKIE, marker)
+        assert (await fresh.get(f"/prompts/{prompt_id}", headers=headers)).status_code == 200
+        # The marker only pins its own user's reads
+        assert (await fresh.get(f"/prompts/{prompt_id}", headers=other_headers)).status_code == 404
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as fresh:
+        assert (await fresh.get(f"/prompts/{prompt_id}", headers=headers)).status_code == 404
+        fresh.cookies.set(READ_YOUR_WRITES_COOKIE, "forged")
+        assert (await fresh.get(f"/prompts/{prompt_id}", headers=headers)).status_code == 404
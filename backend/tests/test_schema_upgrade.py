@@ -0,0 +1,48 @@
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from backend import database as models
+
+
+@pytest.fixture
+def old_database(monkeypatch):
+    """Points the schema helpers at a database whose prompts table predates the excerpt column."""
+    engine = create_engine("sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="prompt-upgrade-"), "old.db"))
+    models.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ALTER TABLE prompts DROP COLUMN excerpt")
+        conn.exec_driver_sql("INSERT INTO prompts (title, content, subject) VALUES ('제목', '**베이즈** 정리', '확률통계')")
+    monkeypatch.setattr(models, "engine", engine)
+    yield engine
+    engine.dispose()
+
+
+def test_excerpts_are_backfilled_only_when_the_column_is_added(old_database, monkeypatch):
+    models.create_db_and_tables()
+    with old_database.connect() as conn:
+        assert conn.execute(text("SELECT excerpt FROM prompts")).scalar() is not None
+
+    backfills = []
+    monkeypatch.setattr(models, "backfill_excerpts", lambda: backfills.append(1))
+    models.create_db_and_tables()
+    assert backfills == []
+
+
+def test_column_added_by_another_worker_is_not_an_error(old_database, monkeypatch):
+    models.add_column_once("prompts", "excerpt", "VARCHAR")
+
+    # This worker inspected the table just before another worker added the column
+    columns_before = [c for c in inspect(old_database).get_columns("prompts") if c["name"] != "excerpt"]
+
+    class StaleInspector:
+        calls = 0
+
+        def get_columns(self, table):
+            StaleInspector.calls += 1
+            return columns_before if StaleInspector.calls == 1 else inspect(old_database).get_columns(table)
+
+    monkeypatch.setattr(models, "inspect", lambda bind: StaleInspector())
+    assert models.add_column_once("prompts", "excerpt", "VARCHAR") is False
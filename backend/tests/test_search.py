@@ -0,0 +1,105 @@
+import uuid
+
+import pytest
+
+from backend import database as models
+from backend.search import SEARCH_MAX_LIMIT
+
+pytestmark = pytest.mark.anyio
+
+
+def unique_word() -> str:
+    return "w" + uuid.uuid4().hex[:12]
+
+
+@pytest.fixture
+def add_prompt(make_users):
+    (owner_id, _), = make_users(1)
+
+    def add(title: str, content: str) -> int:
+        db = models.SessionLocal()
+        try:
+            prompt = models.Prompt(title=title, content=content, subject="확률통계", owner_id=owner_id)
+            db.add(prompt)
+            db.commit()
+            return prompt.id
+        finally:
+            db.close()
+
+    return add
+
+
+async def search_ids(client, q, **params):
+    response = await client.get("/prompts/search", params={"q": q, **params})
+    assert response.status_code == 200, (q, response.text)
+    return [result["id"] for result in response.json()]
+
+
+@pytest.mark.parametrize("operator", ['"', '""', "*", "NEAR", "NEAR(", "-", "AND", "OR", "NOT", "^", ":", "(", ")", "title:"])
+async def test_fts_operators_in_the_query_are_matched_as_text(client, add_prompt, operator):
+    word = unique_word()
+    prompt_id = add_prompt("연산자", f"{word} {operator} 정리")
+
+    # Alone or next to a term, the operator is searched for rather than parsed
+    await search_ids(client, operator)
+    assert await search_ids(client, f"{word} {operator}") == [prompt_id]
+    assert await search_ids(client, f"{operator} {word}") == [prompt_id]
+
+
+async def test_near_and_minus_are_not_operators(client, add_prompt):
+    word, other = unique_word(), unique_word()
+    nearby = add_prompt("근접", f"{word} and then {other}")
+    literal = add_prompt("문자 그대로", f"NEAR({word} {other})")
+    alone = add_prompt("단독", f"{word} only")
+
+    # As an operator NEAR(a b) would also match `nearby`; as text it needs the word "near"
+    assert await search_ids(client, f"NEAR({word} {other})") == [literal]
+    # As an operator -b would exclude b; as text it requires it
+    assert sorted(await search_ids(client, f"{word} -{other}")) == sorted([nearby, literal])
+    assert alone in await search_ids(client, word)
+
+
+async def test_snippets_escape_the_prompt_text(client, add_prompt):
+    word = unique_word()
+    add_prompt("스니펫", f"<script>alert(1)</script> {word}")
+
+    (result,) = (await client.get("/prompts/search", params={"q": word})).json()
+    assert "<script>" not in result["snippet"]
+    assert "&lt;script&gt;" in result["snippet"]
+    assert f"<mark>{word}</mark>" in result["snippet"]
+
+
+async def test_limit_is_bounded(client, add_prompt):
+    word = unique_word()
+    for i in range(3):
+        add_prompt(f"제한 {i}", word)
+
+    assert len(await search_ids(client, word, limit=1)) == 1
+    assert len(await search_ids(client, word, limit=SEARCH_MAX_LIMIT)) == 3
+    for limit in (0, -1, SEARCH_MAX_LIMIT + 1):
+        response = await client.get("/prompts/search", params={"q": word, "limit": limit})
+        assert response.status_code == 422, limit
+
+
+async def test_index_follows_inserts_updates_and_deletes(client, add_prompt):
+    old, new = unique_word(), unique_word()
+    prompt_id = add_prompt("동기화", f"{old} 내용")
+    assert await search_ids(client, old) == [prompt_id]
+
+    db = models.SessionLocal()
+    try:
+        db.get(models.Prompt, prompt_id).content = f"{new} 내용"
+        db.commit()
+        assert await search_ids(client, old) == []
+        assert await search_ids(client, new) == [prompt_id]
+
+        # Counter updates do not touch the index
+        db.get(models.Prompt, prompt_id).views += 1
+        db.commit()
+        assert await search_ids(client, new) == [prompt_id]
+
+        db.delete(db.get(models.Prompt, prompt_id))
+        db.commit()
+        assert await search_ids(client, new) == []
+    finally:
+        db.close()
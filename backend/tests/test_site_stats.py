@@ -0,0 +1,57 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.stats import SiteStats
+
+
+class BlockingTotals:
+    """Stands in for the session: each aggregate query returns `totals` once `release` is set."""
+
+    def __init__(self, totals):
+        self.totals = totals
+        self.queries = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def execute(self, statement):
+        self.queries += 1
+        self.started.set()
+        assert self.release.wait(10)
+        return self
+
+    def one(self):
+        return self.totals
+
+
+def test_only_one_caller_resyncs_and_changes_during_it_are_kept():
+    stats = SiteStats(resync_interval=60)
+    db = BlockingTotals((10, 5))
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        callers = [pool.submit(stats.summary, db) for _ in range(20)]
+        assert db.started.wait(10)
+        # Written while the aggregate query runs; its result may not include them
+        stats.prompt_created()
+        stats.likes_changed(2)
+        db.release.set()
+        summaries = [caller.result(10) for caller in callers]
+
+    assert db.queries == 1
+    assert summaries == [{"prompt_count": 11, "total_likes": 7}] * 20
+
+
+def test_stale_counters_are_served_while_another_caller_resyncs():
+    stats = SiteStats(resync_interval=0)
+    first = BlockingTotals((1, 1))
+    first.release.set()
+    stats.summary(first)
+
+    db = BlockingTotals((2, 3))
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        resyncing = pool.submit(stats.summary, db)
+        assert db.started.wait(10)
+        # Does not wait for the slow query
+        assert stats.summary(db) == {"prompt_count": 1, "total_likes": 1}
+        db.release.set()
+        assert resyncing.result(10) == {"prompt_count": 2, "total_likes": 3}
+    assert db.queries == 1
@@ -0,0 +1,30 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_limit_applies_with_and_without_cursor(client, make_users, make_prompts):
+    (user_id, headers), = make_users(1)
+    make_prompts(user_id, 5)
+
+    response = await client.get("/users/me/prompts?limit=2", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+    response = await client.get("/users/me/prompts?limit=2&cursor=", headers=headers)
+    assert len(response.json()) == 2
+    assert response.headers["X-Next-Cursor"]
+
+
+async def test_following_the_cursor_returns_every_prompt(client, make_users, make_prompts):
+    (user_id, headers), = make_users(1)
+    prompt_ids = make_prompts(user_id, 5)
+
+    # Same walk as the my-page frontend: start with an empty cursor, stop when no header comes back
+    seen, cursor = [], ""
+    while cursor is not None:
+        response = await client.get("/users/me/prompts", params={"limit": 2, "cursor": cursor}, headers=headers)
+        assert response.status_code == 200
+        seen += [p["id"] for p in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+    assert seen == sorted(prompt_ids, reverse=True)
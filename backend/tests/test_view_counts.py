@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import event
+
+from backend import database as models
+from backend.counters import counters_with_pending, view_buffer
+
+pytestmark = pytest.mark.anyio
+
+
+def stored_views(prompt_id: int) -> int:
+    db = models.SessionLocal()
+    try:
+        return db.get(models.Prompt, prompt_id).views
+    finally:
+        db.close()
+
+
+async def test_repeat_views_from_a_user_are_counted_once(client, make_users, make_prompts):
+    (owner_id, _), (_, viewer), (_, other_viewer) = make_users(3)
+    (prompt_id,) = make_prompts(owner_id)
+
+    views = []
+    for headers in (viewer, viewer, other_viewer, viewer):
+        response = await client.post(f"/prompts/{prompt_id}/increment-view", headers=headers)
+        assert response.status_code == 200
+        views.append(response.json()["views"])
+    assert views == [1, 1, 2, 2]
+
+
+async def test_buffered_views_reach_the_row_on_flush(client, make_users, make_prompts):
+    (owner_id, _), *viewers = make_users(4)
+    (prompt_id,) = make_prompts(owner_id)
+    for _, headers in viewers:
+        await client.post(f"/prompts/{prompt_id}/increment-view", headers=headers)
+
+    view_buffer.flush()
+    assert view_buffer.pending(prompt_id) == 0
+    assert stored_views(prompt_id) == 3
+    exact = await client.get(f"/prompts/{prompt_id}?exact_views=true")
+    assert exact.json()["views"] == 3
+
+
+async def test_view_written_through_immediately_is_counted(client, make_users, make_prompts, monkeypatch):
+    (owner_id, _), (_, viewer) = make_users(2)
+    (prompt_id,) = make_prompts(owner_id)
+    # With no flush interval, add() writes the view before the response is built
+    monkeypatch.setattr(view_buffer, "flush_interval", 0)
+
+    response = await client.post(f"/prompts/{prompt_id}/increment-view", headers=viewer)
+    assert response.json()["views"] == 1
+    assert stored_views(prompt_id) == 1
+
+
+def test_flush_during_the_counter_read_is_counted_once(app, make_users, make_prompts):
+    (owner_id, _), = make_users(1)
+    (prompt_id,) = make_prompts(owner_id)
+    view_buffer.add(prompt_id, 3)
+
+    # Flush on another connection right after the counters are read, as the flush thread might
+    flushed = []
+
+    def flush_after_read(conn, cursor, statement, *args):
+        if not flushed and statement.lstrip().startswith("SELECT prompts.views"):
+            flushed.append(True)
+            view_buffer.flush()
+
+    db = models.SessionLocal()
+    event.listen(models.engine, "after_cursor_execute", flush_after_read)
+    try:
+        views, _, _ = counters_with_pending(db, prompt_id)
+    finally:
+        event.remove(models.engine, "after_cursor_execute", flush_after_read)
+        db.close()
+    assert flushed
+    assert views == 3
@@ -51,20 +51,16 @@ export const AuthProvider = ({ children }: { children: ReactNode }) => {
   useEffect(() => {
     async function fetchStats() {
       try {
-        const [promptsCountResponse, totalLikesResponse] = await Promise.all([
-          fetch(`${API_URL}/stats/prompts/count`),
-          fetch(`${API_URL}/stats/prompts/total-likes`),
-        ]);
+        const response = await fetch(`${API_URL}/stats/summary`);
 
-        if (!promptsCountResponse.ok || !totalLikesResponse.ok) {
+        if (!response.ok) {
           throw new Error("Failed to fetch statistics");
         }
 
-        const promptsCount = await promptsCountResponse.json();
-        const totalLikesCount = await totalLikesResponse.json();
+        const stats = await response.json();
 
-        setTotalPrompts(promptsCount);
-        setTotalLikes(totalLikesCount);
+        setTotalPrompts(stats.prompt_count);
+        setTotalLikes(stats.total_likes);
       } catch (error) {
         console.error("Error fetching statistics:", error);
       }